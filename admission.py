@@ -0,0 +1,243 @@
+"""
+Admission control and load shedding for GuideFY.
+Each route class (LLM-bound, CPU-bound extraction/NLP, static) gets its own
+bounded concurrency limit and a short bounded wait queue, so a slow Gemini
+backend can exhaust only the LLM slots while /api-status and the static pages
+keep answering. Requests that cannot be admitted in time are rejected fast
+with 503 + Retry-After, or answered with a degraded response when the route
+provides one.
+
+Both executing and queued requests hold a server thread, so the limits are
+derived from the worker's thread count (GUNICORN_THREADS). The LLM and CPU
+classes draw from one shared budget of threads (slots plus queue) that leaves
+at least a quarter of them (minimum one) for static routes such as /api-status;
+otherwise slow Gemini calls would occupy every thread before the LLM class
+rejected anything. Within the budget either class can use what the other leaves idle.
+
+Configuration (environment), per class NAME in LLM, CPU, STATIC:
+    ADMISSION_<NAME>_CONCURRENCY   Requests executing at once
+    ADMISSION_<NAME>_QUEUE         Requests allowed to wait for a slot
+    ADMISSION_<NAME>_TIMEOUT       Seconds a request may wait before it is shed
+    ADMISSION_BUDGET               Threads the LLM and CPU classes may hold together
+    GUNICORN_THREADS               Threads per worker the defaults are sized for (default 4)
+"""
+
+import math
+import os
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+from flask import jsonify
+
+from logs import get_logger
+
+log = get_logger("admission")
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted to its route class."""
+
+    def __init__(self, route_class: str, reason: str, retry_after: int):
+        super().__init__(f"{route_class} overloaded ({reason})")
+        self.route_class = route_class
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RouteClass:
+    """
+    Bounded concurrency limit with a bounded, time-limited wait queue.
+
+    Args:
+        name (str): Class name used in stats and errors.
+        max_concurrent (int): Requests allowed to execute at once.
+        max_queue (int): Requests allowed to wait for a slot; more are rejected immediately.
+        queue_timeout (float): Seconds a queued request waits before being rejected.
+        budget (Semaphore, optional): Thread budget shared with other classes; a request that
+            can't take a unit of it (running or queued) is rejected immediately.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float,
+                 budget: Optional[threading.Semaphore] = None):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = max(0.0, queue_timeout)
+        self.retry_after = max(1, math.ceil(self.queue_timeout))
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._budget = budget
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.rejected_budget = 0
+
+    def acquire(self) -> None:
+        """Takes a slot, waiting in the queue if needed; raises AdmissionRejected when shed."""
+        if self._budget is not None and not self._budget.acquire(blocking=False):
+            with self._lock:
+                self.rejected_budget += 1
+            raise AdmissionRejected(self.name, "thread budget exhausted", self.retry_after)
+        try:
+            self._take_slot()
+        except AdmissionRejected:
+            if self._budget is not None:
+                self._budget.release()
+            raise
+
+    def _take_slot(self) -> None:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.queued >= self.max_queue:
+                    self.rejected_queue_full += 1
+                    raise AdmissionRejected(self.name, "queue full", self.retry_after)
+                self.queued += 1
+                self.peak_queued = max(self.peak_queued, self.queued)
+            try:
+                acquired = self._slots.acquire(timeout=self.queue_timeout) if self.queue_timeout else False
+            finally:
+                with self._lock:
+                    self.queued -= 1
+            if not acquired:
+                with self._lock:
+                    self.rejected_timeout += 1
+                raise AdmissionRejected(self.name, "queue timeout", self.retry_after)
+
+        with self._lock:
+            self.in_flight += 1
+            self.admitted += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+        if self._budget is not None:
+            self._budget.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queued,
+                "peak_queue_depth": self.peak_queued,
+                "admitted": self.admitted,
+                "rejected_queue_full": self.rejected_queue_full,
+                "rejected_timeout": self.rejected_timeout,
+                "rejected_budget": self.rejected_budget
+            }
+
+
+# Route classes that draw from the shared thread budget
+BUDGETED_CLASSES = ("llm", "cpu")
+
+
+def default_budget(threads: int) -> int:
+    """Threads the LLM and CPU classes may hold together: all but a quarter (minimum one)."""
+    return max(1, threads - max(1, threads // 4))
+
+
+def default_limits(threads: int, cpus: int) -> Dict[str, tuple]:
+    """
+    Per-class (max_concurrent, max_queue, queue_timeout) for a worker with `threads` threads.
+    Each budgeted class may use the whole budget on its own: about two thirds of it as slots
+    (the CPU class at most one per core) and the rest as queue.
+    """
+    threads = max(1, threads)
+    budget = default_budget(threads)
+    llm_slots = max(1, math.ceil(budget * 2 / 3))
+    cpu_slots = max(1, min(cpus, llm_slots))
+    return {
+        "llm": (llm_slots, budget - llm_slots, 2.0),
+        "cpu": (cpu_slots, max(0, budget - cpu_slots), 5.0),
+        "static": (threads, threads, 1.0)
+    }
+
+
+THREADS = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# name -> (max_concurrent, max_queue, queue_timeout)
+DEFAULT_LIMITS = default_limits(THREADS, os.cpu_count() or 2)
+
+
+class AdmissionController:
+    """
+    Holds the per-class limits for one process.
+
+    Args:
+        limits (dict, optional): name -> (max_concurrent, max_queue, queue_timeout).
+        budget (int, optional): Threads the LLM and CPU classes may hold together;
+            defaults to default_budget(GUNICORN_THREADS). 0 disables the shared budget.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, tuple]] = None, budget: Optional[int] = None):
+        self.budget = default_budget(THREADS) if budget is None else budget
+        shared = threading.Semaphore(self.budget) if self.budget > 0 else None
+        self.classes = {
+            name: RouteClass(name, *params, budget=shared if name in BUDGETED_CLASSES else None)
+            for name, params in (limits or DEFAULT_LIMITS).items()
+        }
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        limits = {}
+        for name, (concurrency, queue_size, timeout) in DEFAULT_LIMITS.items():
+            prefix = f"ADMISSION_{name.upper()}_"
+            limits[name] = (
+                int(os.getenv(prefix + "CONCURRENCY", concurrency)),
+                int(os.getenv(prefix + "QUEUE", queue_size)),
+                float(os.getenv(prefix + "TIMEOUT", timeout))
+            )
+        budget = int(os.getenv("ADMISSION_BUDGET", default_budget(THREADS)))
+        if budget <= 0 or budget >= THREADS:
+            log.warning(
+                "LLM and CPU admission classes can hold every server thread; static routes may starve",
+                extra={"event": "admission_config", "budget": budget, "threads": THREADS}
+            )
+        return cls(limits, budget)
+
+    @contextmanager
+    def slot(self, route_class: str):
+        """Context manager holding one slot of `route_class`; raises AdmissionRejected if shed."""
+        rc = self.classes[route_class]
+        rc.acquire()
+        try:
+            yield
+        finally:
+            rc.release()
+
+    def admitted(self, route_class: str, degrade: Optional[Callable[..., Any]] = None):
+        """
+        Decorator running a view inside a slot of `route_class`.
+        When the request is shed, `degrade(*args, **kwargs)` is returned if given,
+        otherwise a 503 with Retry-After.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                try:
+                    with self.slot(route_class):
+                        return view(*args, **kwargs)
+                except AdmissionRejected as e:
+                    if degrade is not None:
+                        return degrade(*args, **kwargs)
+                    return rejection_response(e)
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: rc.stats() for name, rc in self.classes.items()}
+
+
+def rejection_response(error: AdmissionRejected):
+    """503 Service Unavailable with a Retry-After hint."""
+    response = jsonify({"error": "Server is busy. Please try again shortly."})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response
@@ -0,0 +1,179 @@
+"""
+Static asset serving for GuideFY.
+Serves the output of build_assets.py: fingerprinted CSS/JS under /assets/ with
+immutable caching, and the HTML pages with revalidation. The best precompressed
+variant is picked from Accept-Encoding, every response carries a strong ETag,
+and conditional requests are answered with 304 Not Modified.
+
+When static/dist/ has not been built (e.g. local development) the pages fall
+back to the source files in static/.
+"""
+
+import json
+import mimetypes
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from flask import Response, abort, request, send_from_directory
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DIST_DIR = os.path.join(BASE_DIR, "static", "dist")
+
+ASSET_URL_PREFIX = "/assets/"
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+PAGE_CACHE = "no-cache"
+
+# Server preference when the client accepts several encodings equally
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """
+    Parses an Accept-Encoding header into {encoding: q-value}.
+    """
+    accepted = {}
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def choose_encoding(header: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """
+    Picks the content coding to send.
+
+    Args:
+        header (str): The request's Accept-Encoding header.
+        available (iterable): Encodings that have a precompressed variant.
+
+    Returns:
+        str: "br" or "gzip", or None for the identity (uncompressed) representation.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in available:
+            continue
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against a strong ETag (RFC 9110)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class AssetStore:
+    """
+    Read-only view of a built static/dist directory.
+    The manifest is loaded on first use and file bodies are cached in memory,
+    so a hit costs a dict lookup and no disk I/O.
+    """
+
+    def __init__(self, dist_dir: str = DIST_DIR):
+        self.dist_dir = dist_dir
+        self._manifest = None
+        self._by_path = {}
+        self._bodies = {}
+        self._lock = threading.Lock()
+
+    def manifest(self) -> Dict[str, Any]:
+        if self._manifest is None:
+            with self._lock:
+                if self._manifest is None:
+                    try:
+                        with open(os.path.join(self.dist_dir, "manifest.json"), "r") as f:
+                            manifest = json.load(f)
+                    except (OSError, ValueError):
+                        manifest = {"assets": {}, "pages": {}}
+                    self._by_path = {e["path"]: e for e in manifest.get("assets", {}).values()}
+                    self._manifest = manifest
+        return self._manifest
+
+    def asset(self, path: str) -> Optional[Dict[str, Any]]:
+        """Returns the manifest entry for a fingerprinted asset path, e.g. css/common.<hash>.css."""
+        self.manifest()
+        return self._by_path.get(path)
+
+    def page(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.manifest().get("pages", {}).get(name)
+
+    def _body(self, rel_path: str) -> bytes:
+        body = self._bodies.get(rel_path)
+        if body is None:
+            with open(os.path.join(self.dist_dir, rel_path), "rb") as f:
+                body = f.read()
+            self._bodies[rel_path] = body
+        return body
+
+    def respond(self, entry: Dict[str, Any], cache_control: str) -> Response:
+        """
+        Builds the response for a manifest entry, honouring Accept-Encoding and If-None-Match.
+        """
+        encoding = choose_encoding(request.headers.get("Accept-Encoding"), entry["variants"])
+        variant = entry["variants"][encoding] if encoding else entry
+        mimetype = mimetypes.guess_type(entry["path"])[0] or "application/octet-stream"
+
+        if etag_matches(request.headers.get("If-None-Match"), variant["etag"]):
+            response = Response(status=304)
+        else:
+            response = Response(self._body(variant["path"]), mimetype=mimetype)
+            if encoding:
+                response.headers["Content-Encoding"] = encoding
+
+        response.headers["ETag"] = variant["etag"]
+        response.headers["Cache-Control"] = cache_control
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+# Process-wide store for the default static/dist directory
+STORE = AssetStore()
+
+
+def serve_asset(filename: str):
+    """Serves a fingerprinted CSS/JS file built by build_assets.py."""
+    entry = STORE.asset(filename)
+    if entry is None:
+        abort(404)
+    return STORE.respond(entry, IMMUTABLE_CACHE)
+
+
+def serve_page(name: str):
+    """
+    Serves an HTML page, preferring the built copy that references fingerprinted assets.
+    """
+    entry = STORE.page(name)
+    if entry is None:
+        return send_from_directory("static", name)
+    return STORE.respond(entry, PAGE_CACHE)
+
+
+def init_app(app) -> AssetStore:
+    """Registers the fingerprinted asset route on the Flask app."""
+    app.add_url_rule(ASSET_URL_PREFIX + "<path:filename>", "serve_asset", serve_asset)
+    return STORE
@@ -0,0 +1,161 @@
+"""
+Micro-batching of independent Gemini prompts.
+Requests that arrive within a short window are combined into one structured
+multi-item prompt, sent as a single API call, and the JSON result is split
+back out to the waiting request threads. Under a fixed requests-per-minute
+quota this turns N round trips (and N chances of a 429) into one.
+
+The wait queue is bounded and at most `max_inflight` calls are outstanding, so
+under overload submit() fails fast with BatchQueueFull instead of queueing
+without limit, and items whose caller already gave up (timed out) are dropped
+before the prompt is built rather than spending quota on them.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class BatchItemError(Exception):
+    """Raised to a waiting caller when its item is missing or malformed in the batch result."""
+
+
+class BatchQueueFull(Exception):
+    """Raised by submit() when the wait queue is full; the caller should shed to its fallback."""
+
+
+class PromptBatcher:
+    """
+    Collects prompts for `window` seconds (or until `max_batch` arrive) and sends them together.
+
+    Args:
+        generate (callable): Sends a prompt string and returns the model's text response.
+        single_prompt (callable): item -> prompt, used when a window closes with one item.
+        batch_prompt (callable): [(item_id, item), ...] -> prompt asking for a JSON object keyed by item id.
+        parse (callable): Model text -> dict (e.g. utils.extract_json).
+        validate (callable, optional): Per-item result check; items failing it are rejected individually.
+        window (float): Collection window in seconds.
+        max_batch (int): Maximum items per API call.
+        max_inflight (int): Maximum concurrent batch calls.
+        max_queue (int): Items allowed to wait for a batch; submit() raises BatchQueueFull beyond it.
+    """
+
+    def __init__(self, generate: Callable[[str], str], single_prompt: Callable[[Any], str],
+                 batch_prompt: Callable[[List[Tuple[str, Any]]], str], parse: Callable[[str], Dict[str, Any]],
+                 validate: Optional[Callable[[Any], bool]] = None, window: float = 0.05,
+                 max_batch: int = 8, max_inflight: int = 4, max_queue: int = 64):
+        self.generate = generate
+        self.single_prompt = single_prompt
+        self.batch_prompt = batch_prompt
+        self.parse = parse
+        self.validate = validate or (lambda result: isinstance(result, dict))
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self.max_inflight = max(1, max_inflight)
+        self.max_queue = max(1, max_queue)
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"items": 0, "calls": 0, "item_failures": 0, "shed": 0, "cancelled": 0}
+
+    def _ensure_started(self) -> None:
+        # Threads don't survive fork, so each (gunicorn worker) process starts its own dispatcher
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._inflight = threading.BoundedSemaphore(self.max_inflight)
+            self._pool = ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix="batch-call")
+            threading.Thread(target=self._dispatch, name="prompt-batcher", daemon=True).start()
+            self._pid = os.getpid()
+
+    def submit(self, item: Any, timeout: Optional[float] = 60.0) -> Dict[str, Any]:
+        """
+        Queues an item and blocks until its parsed result is available.
+
+        Raises:
+            BatchQueueFull: If the wait queue is full (nothing was queued).
+            BatchItemError: If this item's result was missing or invalid.
+            Exception: Any error from the API call itself, or TimeoutError. A timed-out item
+                that has not been sent yet is cancelled, so it never reaches the API.
+        """
+        self._ensure_started()
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((item, future))
+        except queue.Full:
+            with self._stats_lock:
+                self.stats["shed"] += 1
+            raise BatchQueueFull("Prompt batch queue is full")
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def _dispatch(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            # Waiting here (rather than in the executor's unbounded work queue) keeps the backlog
+            # in the bounded item queue, where submit() can shed it
+            self._inflight.acquire()
+            self._pool.submit(self._run, batch)
+
+    def _run(self, batch: List[Tuple[Any, Future]]) -> None:
+        try:
+            self._call(batch)
+        finally:
+            self._inflight.release()
+
+    def _call(self, batch: List[Tuple[Any, Future]]) -> None:
+        # Drop items whose caller timed out while they waited; the rest can no longer be cancelled
+        live = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        with self._stats_lock:
+            self.stats["cancelled"] += len(batch) - len(live)
+            if live:
+                self.stats["items"] += len(live)
+                self.stats["calls"] += 1
+        if not live:
+            return
+        batch = live
+        try:
+            if len(batch) == 1:
+                item, future = batch[0]
+                result = self.parse(self.generate(self.single_prompt(item)))
+                self._resolve(future, result)
+                return
+
+            ids = [f"r{i}" for i in range(len(batch))]
+            prompt = self.batch_prompt([(item_id, item) for item_id, (item, _) in zip(ids, batch)])
+            results = self.parse(self.generate(prompt))
+            if not isinstance(results, dict):
+                raise ValueError("Batch response is not a JSON object")
+            for item_id, (_, future) in zip(ids, batch):
+                self._resolve(future, results.get(item_id))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _resolve(self, future: Future, result: Any) -> None:
+        if self.validate(result):
+            future.set_result(result)
+        else:
+            with self._stats_lock:
+                self.stats["item_failures"] += 1
+            future.set_exception(BatchItemError("Missing or malformed item in batch response"))
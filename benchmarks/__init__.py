@@ -0,0 +1,20 @@
+"""
+GuideFY Benchmark Suite
+-----------------------
+Offline, reproducible performance harness for the GuideFY backend.
+
+Modules:
+    stubs      - Local stand-ins for the Gemini and YouTube APIs (latency + 429 injection)
+    corpus     - Synthetic PDF/DOCX resumes and /career payloads
+    micro      - Micro-benchmarks for the text processing helpers
+    load       - Load generator reporting RPS and p50/p95/p99 for /career and /resume-analyze
+    importtime - Cold-start import time report (python -X importtime) with a budget check
+    semantic_cache - Lookup/insert latency of the /career semantic cache at 100k entries
+    textnorm   - Shared text normalization + resume scorers on 1-50 page resumes
+    history    - History store record() cost, sustained write rate and lookup latency
+
+Run from the repository root, e.g.:
+    python -m benchmarks.micro
+    python -m benchmarks.load --route career --requests 500 --concurrency 16
+    python -m benchmarks.importtime --budget-ms 400
+"""
@@ -0,0 +1,194 @@
+"""
+Synthetic inputs for the benchmark suite.
+
+Generates deterministic resume text (rendered to PDF or DOCX bytes) and
+/career payloads so benchmark runs are reproducible without real user data.
+"""
+
+import io
+import random
+from typing import Dict, List, Optional
+
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Sneha", "Alex", "Maria", "Chen", "Fatima", "Liam", "Zara"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Khan", "Smith", "Garcia", "Wang", "Okafor", "Brown", "Mehta"]
+COMPANIES = ["Infosys", "Google", "Tata Consultancy Services", "Microsoft", "Flipkart", "Accenture", "Amazon", "Wipro"]
+CITIES = ["Bengaluru", "Pune", "Hyderabad", "London", "New York", "Singapore"]
+SKILLS = [
+    "Python", "Java", "JavaScript", "React", "Node", "SQL", "AWS", "Docker", "Kubernetes", "Git",
+    "Machine Learning", "TensorFlow", "PyTorch", "HTML", "CSS", "MongoDB", "PostgreSQL", "Flask", "Django"
+]
+SOFT_SKILLS = ["Leadership", "Communication", "Teamwork", "Problem Solving", "Analytical", "Collaborative"]
+VERBS = ["Developed", "Designed", "Implemented", "Managed", "Led", "Improved", "Optimized", "Delivered", "Built", "Launched"]
+OBJECTS = [
+    "a data pipeline processing daily sales events",
+    "the customer onboarding service",
+    "an internal analytics dashboard",
+    "a recommendation model for product search",
+    "CI/CD workflows for microservices",
+    "a REST API used by mobile clients"
+]
+DEGREES = ["Bachelor of Technology in Computer Science", "Master of Science in Data Science", "BSc Mathematics", "Diploma in Software Engineering"]
+UNIVERSITIES = ["IIT Bombay", "University of Pune", "Anna University", "University of London"]
+
+INTERESTS = ["coding", "AI", "machine learning", "healthcare", "farming", "public policy", "entrepreneurship", "cyber security", "design", "finance"]
+STRENGTHS = ["analytical thinking", "problem solving", "communication", "leadership", "creativity", "attention to detail", "teamwork"]
+SUBJECTS = ["mathematics", "computer science", "biology", "economics", "political science", "physics", "commerce", "agriculture"]
+GOALS = ["become a software engineer", "work in AI research", "become a doctor", "start my own business", "join civil services", "work in cyber security"]
+
+
+def resume_text(pages: int = 1, seed: Optional[int] = 0) -> str:
+    """
+    Builds a plain text resume with the usual contact, skills, experience,
+    projects and education sections.
+
+    Args:
+        pages (int): Approximate number of pages of content to produce.
+        seed (int, optional): Seed for reproducible output.
+
+    Returns:
+        str: Multi-line resume text.
+    """
+    rng = random.Random(seed)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{name.split()[0].lower()}.{name.split()[1].lower()}@example.com | +91 98765 43210 | {rng.choice(CITIES)}",
+        "",
+        "SUMMARY",
+        f"Senior software engineer with {rng.randint(3, 12)}+ years of experience building reliable, data driven products.",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 10)),
+        ", ".join(rng.sample(SOFT_SKILLS, 4)),
+        "",
+        "EXPERIENCE"
+    ]
+
+    # Roughly 45 lines per page of experience/project content
+    for _ in range(max(1, pages * 5)):
+        start = rng.randint(2012, 2021)
+        lines.append(f"{rng.choice(['Software Engineer', 'Data Engineer', 'Team Lead', 'Backend Developer'])} - {rng.choice(COMPANIES)}, {rng.choice(CITIES)}")
+        lines.append(f"Jan {start} - Dec {start + rng.randint(1, 3)}")
+        for _ in range(6):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}, improving throughput by {rng.randint(5, 80)}% for {rng.randint(2, 50)}+ teams.")
+        lines.append("")
+
+    lines.append("PROJECTS")
+    for _ in range(max(1, pages)):
+        lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)} and {rng.choice(SKILLS)} (3x faster).")
+    lines.append("")
+
+    lines.append("EDUCATION")
+    lines.append(f"{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)}, {rng.randint(2008, 2016)}")
+    lines.append("Certification: AWS Certified Cloud Practitioner")
+
+    return "\n".join(lines)
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def to_pdf(text: str, lines_per_page: int = 48) -> bytes:
+    """
+    Renders text into a minimal multi-page PDF readable by PyPDF2.
+
+    Args:
+        text (str): The text to render, one PDF line per text line.
+        lines_per_page (int): Lines per page before a page break.
+
+    Returns:
+        bytes: The PDF document.
+    """
+    lines = [l.encode("latin-1", "replace").decode("latin-1") for l in text.splitlines()] or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    # Object layout: 1 catalog, 2 pages tree, 3 font, then (page, content) pairs
+    objects: List[bytes] = []
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages)))
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for i, page_lines in enumerate(pages):
+        stream = ["BT", "/F1 10 Tf", "14 TL", "50 800 Td"]
+        for line in page_lines:
+            stream.append(f"({_pdf_escape(line)}) Tj T*")
+        stream.append("ET")
+        content = "\n".join(stream).encode("latin-1")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length " + str(len(content)).encode() + b" >>\nstream\n" + content + b"\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{num} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    xref_pos = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for off in offsets:
+        out.write(f"{off:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_pos}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def to_docx(text: str) -> bytes:
+    """
+    Renders text into a DOCX document, one paragraph per line.
+
+    Args:
+        text (str): The text to render.
+
+    Returns:
+        bytes: The DOCX document.
+    """
+    from docx import Document
+
+    doc = Document()
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def resume_files(count: int = 10, pages: int = 2, seed: int = 0) -> List[Dict[str, object]]:
+    """
+    Builds a mixed corpus of PDF and DOCX resumes.
+
+    Returns:
+        list: Dicts with "filename" and "data" (bytes), alternating PDF and DOCX.
+    """
+    files = []
+    for i in range(count):
+        text = resume_text(pages=pages, seed=seed + i)
+        if i % 2 == 0:
+            files.append({"filename": f"resume_{i}.pdf", "data": to_pdf(text)})
+        else:
+            files.append({"filename": f"resume_{i}.docx", "data": to_docx(text)})
+    return files
+
+
+def career_payloads(count: int = 50, seed: int = 0) -> List[Dict[str, str]]:
+    """
+    Builds varied /career request bodies.
+
+    Returns:
+        list: Dicts with interests, career_goal, strengths and preferred_subjects.
+    """
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(count):
+        payloads.append({
+            "interests": ", ".join(rng.sample(INTERESTS, 2)),
+            "career_goal": rng.choice(GOALS),
+            "strengths": ", ".join(rng.sample(STRENGTHS, 2)),
+            "preferred_subjects": ", ".join(rng.sample(SUBJECTS, 2))
+        })
+    return payloads
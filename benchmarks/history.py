@@ -0,0 +1,60 @@
+"""
+History store benchmark: request-thread cost of record(), sustained write
+throughput of the background writer, and read-through lookup latency.
+
+Usage:
+    python -m benchmarks.history [--rows 20000] [--rate 5000] [--payload-bytes 4000]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+from history import HistoryStore, content_hash
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="GuideFY history store benchmark")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--rate", type=float, default=5000, help="Offered writes per second")
+    parser.add_argument("--payload-bytes", type=int, default=4000, help="Approximate result size")
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    path = os.path.join(tempfile.mkdtemp(), "history.db")
+    store = HistoryStore(path, max_queue=max(10_000, args.rows))
+    result = {"recommendation": {"careers": [{"name": "x", "justification": "y" * args.payload_bytes}]}}
+
+    samples = []
+    start = time.perf_counter()
+    for i in range(args.rows):
+        due = start + i / args.rate
+        while time.perf_counter() < due:
+            pass
+        t0 = time.perf_counter()
+        store.record("career", "llm", f"session-{i % 500}", content_hash(i), {"i": i}, result)
+        samples.append((time.perf_counter() - t0) * 1e6)
+    offered_s = time.perf_counter() - start
+    store.flush(60)
+    total_s = time.perf_counter() - start
+    samples.sort()
+
+    lookups = []
+    for i in range(args.lookups):
+        t0 = time.perf_counter()
+        store.lookup("career", content_hash(i * 7 % args.rows))
+        lookups.append((time.perf_counter() - t0) * 1e6)
+
+    print(f"rows={store.stats['written']} dropped={store.stats['dropped']} batches={store.stats['batches']}")
+    print(f"record median={statistics.median(samples):.1f}us p99={samples[int(len(samples) * 0.99) - 1]:.1f}us")
+    print(f"offered={args.rows / offered_s:.0f}/s written={store.stats['written'] / total_s:.0f}/s")
+    print(f"lookup median={statistics.median(lookups):.1f}us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Cold-start import benchmark.
+
+Imports the backend in a fresh interpreter under `python -X importtime`, reports
+the total import time and the slowest modules, and fails (exit code 1) when a
+deferred heavy dependency is imported eagerly or the time budget is exceeded.
+Run it in CI to catch cold-start regressions.
+
+Usage:
+    python -m benchmarks.importtime [--module app] [--budget-ms 400] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# Modules that must not be imported just by loading the app (see app.HEAVY_MODULES)
+FORBIDDEN_AT_STARTUP = ["google.genai", "requests", "PyPDF2", "docx", "spacy"]
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, object]]:
+    """
+    Parses `-X importtime` output lines of the form
+    "import time: self [us] | cumulative | imported package".
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            _, rest = line.split(":", 1)
+            self_us, cumulative_us, name = rest.split("|", 2)
+            rows.append({
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us)
+            })
+        except ValueError:
+            continue
+    return rows
+
+
+def measure(module: str) -> Dict[str, object]:
+    """Imports `module` in a clean subprocess and returns the parsed timings."""
+    env = dict(os.environ)
+    env.pop("PYTHONSTARTUP", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = parse_importtime(proc.stderr)
+    loaded = {r["module"] for r in rows}
+    return {
+        "total_ms": sum(r["self_us"] for r in rows) / 1000,
+        "module_count": len(rows),
+        "slowest": sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:10],
+        "forbidden_loaded": [m for m in FORBIDDEN_AT_STARTUP if m in loaded]
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="GuideFY cold-start import benchmark")
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to measure")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if median import time exceeds this")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.module) for _ in range(max(1, args.runs))]
+    report = {
+        "module": args.module,
+        "median_ms": round(statistics.median(r["total_ms"] for r in runs), 1),
+        "min_ms": round(min(r["total_ms"] for r in runs), 1),
+        "module_count": runs[-1]["module_count"],
+        "forbidden_loaded": runs[-1]["forbidden_loaded"],
+        "slowest": runs[-1]["slowest"]
+    }
+
+    failures = []
+    if report["forbidden_loaded"]:
+        failures.append(f"heavy modules imported at startup: {', '.join(report['forbidden_loaded'])}")
+    if args.budget_ms is not None and report["median_ms"] > args.budget_ms:
+        failures.append(f"median import time {report['median_ms']}ms exceeds budget {args.budget_ms}ms")
+    report["failures"] = failures
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import {args.module}: median={report['median_ms']}ms min={report['min_ms']}ms "
+              f"modules={report['module_count']} runs={len(runs)}")
+        print(f"{'cumulative (ms)':>16}  module")
+        for row in report["slowest"]:
+            print(f"{row['cumulative_us'] / 1000:>16.1f}  {row['module']}")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
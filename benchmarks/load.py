@@ -0,0 +1,224 @@
+"""
+Offline load generator for the GuideFY API.
+
+Drives `/career` and `/resume-analyze` through the Flask test client with the
+Gemini and YouTube stubs installed, and reports throughput (RPS) and latency
+percentiles. No network access or API keys are required.
+
+Usage:
+    python -m benchmarks.load --route career --requests 500 --concurrency 16
+    python -m benchmarks.load --route resume --gemini-latency 0.8 --rate-limit 0.05
+    python -m benchmarks.load --route career --rpm-quota 60 --batch-window-ms 50 --duration 120
+
+The semantic cache is off for /career by default, so the latencies measure the LLM
+path; --semantic-cache turns it on and reports its hit rate. For the same reason the
+fresh history database (unless --keep-history) records results but does not answer
+repeated requests. Requests shed to the
+degraded local answer by admission control are counted separately ("degraded");
+raise ADMISSION_LLM_CONCURRENCY to measure only the LLM path at high concurrency.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from benchmarks import corpus, stubs
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not samples:
+        return 0.0
+    k = max(0, min(len(samples) - 1, math.ceil(pct / 100.0 * len(samples)) - 1))
+    return samples[k]
+
+
+def summarize(latencies: List[float], statuses: Dict[int, int], elapsed: float, degraded: int = 0) -> Dict[str, float]:
+    """Builds the RPS / percentile report from raw per-request samples."""
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(ordered) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        "statuses": dict(statuses),
+        "degraded": degraded
+    }
+
+
+def _career_requests(count: int):
+    payloads = corpus.career_payloads(count=max(1, min(count, 200)))
+    for payload in itertools.cycle(payloads):
+        yield lambda c, p=payload: c.post("/career", json=p)
+
+
+def _resume_requests(count: int, pages: int):
+    import io
+
+    files = corpus.resume_files(count=max(2, min(count, 20)), pages=pages)
+    for f in itertools.cycle(files):
+        yield lambda c, f=f: c.post(
+            "/resume-analyze",
+            data={"resume": (io.BytesIO(f["data"]), f["filename"])},
+            content_type="multipart/form-data"
+        )
+
+
+def run(route: str, total: int, concurrency: int, pages: int = 2, warmup: int = 5,
+        duration: float = 0.0) -> Dict[str, float]:
+    """
+    Fires `total` requests at `route` using `concurrency` worker threads, or keeps every
+    thread sending requests for `duration` seconds when it is set.
+
+    Args:
+        route (str): "career" or "resume".
+        total (int): Number of measured requests.
+        concurrency (int): Number of concurrent client threads.
+        pages (int): Synthetic resume size for the resume route.
+        warmup (int): Unmeasured requests sent first (imports, spaCy load, caches).
+        duration (float): Run time in seconds instead of a request count, e.g. longer than a
+            60s quota window to measure sustained rather than burst throughput.
+
+    Returns:
+        dict: Report with rps and p50/p95/p99 latencies.
+    """
+    import app as app_module
+
+    flask_app = app_module.app
+    gen = _career_requests(total) if route == "career" else _resume_requests(total, pages)
+    gen_lock = threading.Lock()
+    local = threading.local()
+
+    def client():
+        if not hasattr(local, "client"):
+            local.client = flask_app.test_client()
+        return local.client
+
+    def one(_):
+        with gen_lock:
+            send = next(gen)
+        start = time.perf_counter()
+        resp = send(client())
+        latency = time.perf_counter() - start
+        body = resp.get_json(silent=True) if resp.status_code == 200 else None
+        return latency, resp.status_code, isinstance(body, dict) and bool(body.get("degraded"))
+
+    for i in range(warmup):
+        one(i)
+
+    latencies, statuses, degraded = [], {}, 0
+    started = time.perf_counter()
+    if duration > 0:
+        deadline = started + duration
+
+        def until_deadline(_):
+            results = []
+            while time.perf_counter() < deadline:
+                results.append(one(None))
+            return results
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = [result for results in pool.map(until_deadline, range(concurrency)) for result in results]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(one, range(total)))
+    for latency, status, was_degraded in samples:
+        latencies.append(latency)
+        statuses[status] = statuses.get(status, 0) + 1
+        degraded += was_degraded
+    elapsed = time.perf_counter() - started
+
+    return summarize(latencies, statuses, elapsed, degraded)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="GuideFY offline load generator")
+    parser.add_argument("--route", choices=["career", "resume"], default="career")
+    parser.add_argument("--requests", type=int, default=200, help="Measured request count")
+    parser.add_argument("--duration", type=float, default=0.0,
+                        help="Run for this many seconds instead of a fixed request count")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=2, help="Synthetic resume size in pages")
+    parser.add_argument("--gemini-latency", type=float, default=0.3, help="Stub Gemini latency (s)")
+    parser.add_argument("--youtube-latency", type=float, default=0.1, help="Stub YouTube latency (s)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Probability of an injected 429")
+    parser.add_argument("--rpm-quota", type=int, default=None, help="Stub Gemini requests-per-minute quota")
+    parser.add_argument("--batch-window-ms", type=float, default=None,
+                        help="Enable /career micro-batching with this window (overrides CAREER_BATCH_WINDOW_MS)")
+    parser.add_argument("--with-rate-limit", action="store_true",
+                        help="Keep per-client rate limiting on (all benchmark requests share one client IP)")
+    parser.add_argument("--semantic-cache", action="store_true",
+                        help="Keep the /career semantic cache on (default off, so latencies measure the LLM path)")
+    parser.add_argument("--keep-history", action="store_true",
+                        help="Use the configured history database (default: a fresh one, so earlier runs aren't read through)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON")
+    args = parser.parse_args(argv)
+
+    # Size admission control like a server with a thread per client plus the reserve for static
+    # routes; otherwise the surplus clients would spin on instant 503s
+    os.environ.setdefault("GUNICORN_THREADS", str(args.concurrency + max(1, math.ceil(args.concurrency / 3))))
+    import app as app_module
+
+    installed = stubs.install(
+        app_module,
+        gemini=stubs.StubGeminiClient(latency=args.gemini_latency, rate_limit_prob=args.rate_limit,
+                                      rpm_quota=args.rpm_quota, seed=args.seed),
+        youtube=stubs.StubYouTube(latency=args.youtube_latency, seed=args.seed)
+    )
+    if not args.with_rate_limit:
+        app_module.LIMITER.enabled = False
+    app_module.SEMANTIC_CACHE.enabled = args.semantic_cache
+    if not args.keep_history:
+        from history import HistoryStore
+        # Records sources for the report but never answers repeats (the corpus cycles its payloads)
+        app_module.HISTORY = HistoryStore(os.path.join(tempfile.mkdtemp(), "history.db"), read_through_ttl=0)
+    if args.batch_window_ms is not None:
+        os.environ["CAREER_BATCH_WINDOW_MS"] = str(args.batch_window_ms)
+        app_module.CAREER_BATCHER = app_module.create_career_batcher()
+
+    report = run(args.route, args.requests, args.concurrency, args.pages, duration=args.duration)
+    report["stubs"] = stubs.describe(installed)
+    if not args.keep_history:
+        # Where the answers came from (llm, local fallback, degraded, cache, ...), from the fresh history DB
+        app_module.HISTORY.flush(30)
+        rows = app_module.HISTORY._conn().execute("SELECT source, COUNT(*) FROM history GROUP BY source").fetchall()
+        report["sources"] = dict(rows)
+    if args.semantic_cache:
+        cache = app_module.SEMANTIC_CACHE
+        lookups = cache.hits + cache.misses
+        report["semantic_cache"] = {"hits": cache.hits, "misses": cache.misses,
+                                    "hit_rate": round(cache.hits / lookups, 3) if lookups else 0.0}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"route=/{'career' if args.route == 'career' else 'resume-analyze'} "
+          f"requests={report['requests']} concurrency={args.concurrency}")
+    print(f"  rps={report['rps']}  p50={report['p50_ms']}ms  p95={report['p95_ms']}ms  "
+          f"p99={report['p99_ms']}ms  max={report['max_ms']}ms")
+    print(f"  statuses={report['statuses']}  degraded={report['degraded']}")
+    if "sources" in report:
+        print(f"  sources={report['sources']}")
+    if "semantic_cache" in report:
+        sc = report["semantic_cache"]
+        print(f"  semantic cache hits={sc['hits']} misses={sc['misses']} hit_rate={sc['hit_rate']}")
+    for line in report["stubs"]:
+        print(f"  {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Micro-benchmarks for the CPU-bound helpers on the request path
+(text processing, JSON extraction, field detection, local recommender,
+rate limiter backends, response serialization).
+
+Usage:
+    python -m benchmarks.micro [--pages 2] [--repeat 5] [--number 200]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import timeit
+from typing import Callable, Dict, List
+
+from benchmarks import corpus
+from benchmarks.stubs import CAREER_RESPONSE
+
+
+def measure(fn: Callable[[], object], repeat: int, number: int) -> Dict[str, float]:
+    """
+    Times `fn` with timeit and returns per-call statistics in microseconds.
+    """
+    runs = timeit.repeat(fn, repeat=repeat, number=number)
+    per_call = [r / number * 1e6 for r in runs]
+    return {
+        "min_us": min(per_call),
+        "median_us": statistics.median(per_call),
+        "max_us": max(per_call)
+    }
+
+
+def build_cases(pages: int) -> Dict[str, Callable[[], object]]:
+    """Builds the benchmark closures over a synthetic corpus of the given size."""
+    from utils import extract_json, detect_field
+    from resume_utils import preprocess_resume_text, analyze_resume_keywords, calculate_ats_score, segment_resume
+
+    raw = corpus.resume_text(pages=pages, seed=1)
+    clean = preprocess_resume_text(raw)
+    keywords = analyze_resume_keywords(clean)
+    llm_text = "Here is your result:\n```json\n" + json.dumps(CAREER_RESPONSE) + "\n```"
+    career_text = " ".join(corpus.career_payloads(1, seed=3)[0].values())
+
+    from ratelimit import MemoryBackend, SQLiteBackend
+    from recommender import recommend
+    from responses import compress, dumps, select_fields
+    from utils import normalize_output, load_upskill_db
+
+    career_fields = list(corpus.career_payloads(1, seed=3)[0].values())
+
+    memory_limiter = MemoryBackend()
+    sqlite_limiter = SQLiteBackend(os.path.join(tempfile.mkdtemp(), "ratelimit.db"))
+
+    # A full /career response body; stdlib json with Flask's default settings is the baseline
+    career_body = {"recommendation": normalize_output(CAREER_RESPONSE, career_text, load_upskill_db(), fetch_videos=False)}
+
+    return {
+        "preprocess_resume_text": lambda: preprocess_resume_text(raw),
+        "segment_resume": lambda: segment_resume(raw),
+        "analyze_resume_keywords": lambda: analyze_resume_keywords(clean),
+        "calculate_ats_score": lambda: calculate_ats_score(clean, keywords),
+        "extract_json": lambda: extract_json(llm_text),
+        "detect_field": lambda: detect_field(career_text),
+        "local_recommend": lambda: recommend(*career_fields),
+        "ratelimit_memory": lambda: memory_limiter.consume("ip:127.0.0.1", 1e9, 1e9),
+        "ratelimit_sqlite": lambda: sqlite_limiter.consume("ip:127.0.0.1", 1e9, 1e9),
+        "serialize_stdlib": lambda: json.dumps(career_body, sort_keys=True, separators=(",", ":")).encode("utf-8"),
+        "serialize_api": lambda: dumps(career_body),
+        "serialize_api_trimmed": lambda: dumps(select_fields(career_body, "-recommendation.upskill.platforms")),
+        "serialize_api_gzip": lambda: compress(dumps(career_body), "gzip")
+    }
+
+
+def run(pages: int = 2, repeat: int = 5, number: int = 200, only: List[str] = None) -> Dict[str, Dict[str, float]]:
+    """Runs every (or the selected) micro-benchmark and returns the results by name."""
+    results = {}
+    for name, fn in build_cases(pages).items():
+        if only and name not in only:
+            continue
+        results[name] = measure(fn, repeat, number)
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="GuideFY micro-benchmarks")
+    parser.add_argument("--pages", type=int, default=2, help="Synthetic resume size in pages")
+    parser.add_argument("--repeat", type=int, default=5, help="timeit repeat count")
+    parser.add_argument("--number", type=int, default=200, help="Calls per timeit repeat")
+    parser.add_argument("--only", nargs="*", help="Restrict to these benchmark names")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.pages, args.repeat, args.number, args.only)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'benchmark':<28}{'min (us)':>12}{'median (us)':>14}{'max (us)':>12}")
+    for name, r in results.items():
+        print(f"{name:<28}{r['min_us']:>12.1f}{r['median_us']:>14.1f}{r['max_us']:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
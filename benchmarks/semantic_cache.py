@@ -0,0 +1,64 @@
+"""
+Semantic cache benchmark: lookup and insert latency as the index grows.
+
+Usage:
+    python -m benchmarks.semantic_cache [--entries 100000] [--lookups 2000]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from typing import List
+
+from semantic_cache import SemanticCache, build_feature_vector
+
+FIELDS = ["ai_ml", "technology", "cyber", "medical", "politics", "business", "agriculture"]
+
+
+def synthetic_vocab(size: int, rng: random.Random) -> List[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(size)]
+
+
+def random_vector(vocab: List[str], rng: random.Random):
+    # Skewed term popularity: a head of common lemmas and a long tail of rare ones
+    pick = lambda k: [vocab[int(len(vocab) * rng.random() ** 3)] for _ in range(k)]
+    return build_feature_vector(pick(rng.randint(1, 3)), pick(rng.randint(2, 5)), pick(rng.randint(0, 2)))
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="GuideFY semantic cache benchmark")
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--vocab", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    vocab = synthetic_vocab(args.vocab, rng)
+    cache = SemanticCache(capacity=args.entries, field_thresholds={})
+
+    start = time.perf_counter()
+    for i in range(args.entries):
+        cache.add(FIELDS[i % len(FIELDS)], random_vector(vocab, rng), {"id": i})
+    insert_s = time.perf_counter() - start
+
+    samples = []
+    for i in range(args.lookups):
+        vec = random_vector(vocab, rng)
+        t0 = time.perf_counter()
+        cache.lookup(FIELDS[i % len(FIELDS)], vec)
+        samples.append((time.perf_counter() - t0) * 1e6)
+    samples.sort()
+
+    stats = cache.stats()
+    print(f"entries={stats['entries']} insert={insert_s / args.entries * 1e6:.1f}us/entry")
+    print(f"lookup median={statistics.median(samples):.1f}us p99={samples[int(len(samples) * 0.99) - 1]:.1f}us "
+          f"max={samples[-1]:.1f}us hit_rate={stats['hits'] / max(1, stats['hits'] + stats['misses']):.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Local stand-ins for the external services GuideFY talks to.
+
+The stubs mimic just enough of the `google.genai` client and the YouTube
+Data API (as reached through `requests.get`) for the backend code paths to
+run unchanged, with configurable latency and rate limit (429) injection.
+"""
+
+import collections
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+CAREER_RESPONSE = {
+    "careers": [
+        {"name": "Machine Learning Engineer", "justification": "Strong interest in AI and programming combined with analytical strengths makes this a natural long term pathway to pursue."},
+        {"name": "Data Analyst", "justification": "Analytical thinking and comfort with numbers map directly onto day to day analysis work in most modern organizations."},
+        {"name": "Software Developer", "justification": "Coding interest and problem solving skills provide a solid base for building production software across many industries."}
+    ],
+    "courses": [
+        {"name": "Python for Everybody", "description": "Beginner friendly introduction to programming with Python covering data structures, web data and databases in depth."},
+        {"name": "Machine Learning Specialization", "description": "Covers supervised learning, unsupervised learning and practical advice for building machine learning systems end to end."}
+    ],
+    "next_steps": [
+        {"action": "Build a portfolio", "details": "Create three small end to end projects and publish them on GitHub with clear documentation and results."}
+    ],
+    "confidence_score": {
+        "overall": 74,
+        "breakdown": {"input_detail_quality": 70, "skill_relevance": 75, "career_alignment": 80, "feasibility": 72},
+        "explanation": "Inputs are detailed and consistent, and the suggested roles align closely with the stated interests and strengths."
+    },
+    "skill_gap_analysis": {"missing_skills": ["Statistics", "Deep Learning", "Cloud Deployment"]},
+    "keywords_found": ["python", "ai", "analytical"]
+}
+
+RESUME_RESPONSE = {
+    "strengths": ["Clear technical skill set", "Quantified achievements"],
+    "weaknesses": ["Summary is generic", "Few leadership examples"],
+    "missing_keywords": ["kubernetes", "ci/cd"],
+    "formatting_feedback": "Consistent headings, but the experience section is dense.",
+    "action_items": [
+        {"priority": "high", "item": "Add metrics to the two most recent roles"},
+        {"priority": "low", "item": "Shorten the summary to two lines"}
+    ],
+    "overall_impression": "Solid mid-level profile with room to sharpen impact statements.",
+    "ai_comparison": {
+        "ats_score": 78,
+        "skills_match": "High - core stack is well represented",
+        "keyword_match": "Medium - some platform keywords missing",
+        "final_recommendation": "Tailor keywords per application",
+        "reasoning": "Technical depth is good but keyword coverage varies by role."
+    }
+}
+
+
+# Request ids in a micro-batched career prompt (see app.career_batch_prompt)
+_BATCH_ID_RE = re.compile(r'^\{"id": "(r\d+)"', re.MULTILINE)
+
+
+class StubRateLimitError(Exception):
+    """Raised by the stub client to emulate a Gemini 429 RESOURCE_EXHAUSTED error."""
+
+
+class StubResponse:
+    """Minimal stand-in for a `GenerateContentResponse`."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _StubModels:
+    def __init__(self, owner: "StubGeminiClient"):
+        self._owner = owner
+
+    def generate_content(self, model: str, contents: Any, **kwargs) -> StubResponse:
+        return self._owner._generate(model, contents)
+
+
+class StubGeminiClient:
+    """
+    Drop-in replacement for `genai.Client` used by `generate_with_retry`.
+
+    Args:
+        latency (float): Mean simulated round-trip latency in seconds.
+        jitter (float): Uniform +/- jitter applied to the latency in seconds.
+        rate_limit_prob (float): Probability (0-1) that a call raises a 429 error.
+        rpm_quota (int, optional): Requests-per-minute quota; calls beyond it in a sliding
+            60s window raise a 429 error, like a real per-project quota.
+        seed (int, optional): Seed for reproducible latency and 429 injection.
+    """
+
+    def __init__(self, latency: float = 0.3, jitter: float = 0.05, rate_limit_prob: float = 0.0,
+                 rpm_quota: Optional[int] = None, seed: Optional[int] = 42):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_prob = rate_limit_prob
+        self.rpm_quota = rpm_quota
+        self._window = collections.deque()
+        self.models = _StubModels(self)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rate_limited = 0
+
+    def _generate(self, model: str, contents: Any) -> StubResponse:
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            limited = self._rng.random() < self.rate_limit_prob
+            if self.rpm_quota is not None:
+                now = time.monotonic()
+                while self._window and now - self._window[0] > 60:
+                    self._window.popleft()
+                if len(self._window) >= self.rpm_quota:
+                    limited = True
+                else:
+                    self._window.append(now)
+            if limited:
+                self.rate_limited += 1
+
+        time.sleep(delay)
+        if limited:
+            raise StubRateLimitError(f"429 RESOURCE_EXHAUSTED: quota exceeded for {model}")
+
+        prompt = contents if isinstance(contents, str) else str(contents)
+        if "confidence_score" not in prompt:
+            payload = RESUME_RESPONSE
+        elif _BATCH_ID_RE.search(prompt):
+            payload = {item_id: CAREER_RESPONSE for item_id in _BATCH_ID_RE.findall(prompt)}
+        else:
+            payload = CAREER_RESPONSE
+        return StubResponse("```json\n" + json.dumps(payload) + "\n```")
+
+
+class _StubHTTPResponse:
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+        self.status_code = 200
+
+    def json(self) -> Dict[str, Any]:
+        return self._data
+
+
+class StubYouTube:
+    """
+    Callable replacement for `requests.get` that answers YouTube search queries.
+
+    Args:
+        latency (float): Simulated latency per search in seconds.
+        rate_limit_prob (float): Probability (0-1) of returning a quota error payload.
+        seed (int, optional): Seed for reproducible error injection.
+    """
+
+    def __init__(self, latency: float = 0.1, rate_limit_prob: float = 0.0, seed: Optional[int] = 7):
+        self.latency = latency
+        self.rate_limit_prob = rate_limit_prob
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def __call__(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None, **kwargs) -> _StubHTTPResponse:
+        with self._lock:
+            self.calls += 1
+            limited = self._rng.random() < self.rate_limit_prob
+        time.sleep(self.latency)
+
+        if limited:
+            return _StubHTTPResponse({"error": {"code": 429, "message": "quotaExceeded"}})
+
+        count = int((params or {}).get("maxResults", 3))
+        return _StubHTTPResponse({"items": [self._item(i) for i in range(count)]})
+
+    @staticmethod
+    def _item(i: int) -> Dict[str, Any]:
+        video_id = f"stubvideo{i:02d}"
+        return {
+            "id": {"videoId": video_id},
+            "snippet": {
+                "title": f"Career roadmap part {i + 1}",
+                "thumbnails": {"high": {"url": f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"}}
+            }
+        }
+
+
+def install(app_module, gemini: Optional[StubGeminiClient] = None, youtube: Optional[StubYouTube] = None) -> Dict[str, Any]:
+    """
+    Points the imported GuideFY backend at the stubs instead of the live APIs.
+
+    Args:
+        app_module: The imported `app` module.
+        gemini (StubGeminiClient, optional): Gemini stand-in. A default one is created if None.
+        youtube (StubYouTube, optional): YouTube stand-in. A default one is created if None.
+
+    Returns:
+        dict: The installed stubs, keyed by "gemini" and "youtube".
+    """
+    import requests
+    import utils
+
+    gemini = gemini or StubGeminiClient()
+    youtube = youtube or StubYouTube()
+
+    app_module.client = gemini
+    app_module.AI_STATUS["api_key_loaded"] = True
+    utils.YOUTUBE_API_KEY = "stub-youtube-key"
+    requests.get = youtube
+
+    return {"gemini": gemini, "youtube": youtube}
+
+
+def describe(stubs: Dict[str, Any]) -> List[str]:
+    """Returns human readable call counters for the installed stubs."""
+    gemini = stubs["gemini"]
+    youtube = stubs["youtube"]
+    return [
+        f"gemini calls={gemini.calls} rate_limited={gemini.rate_limited}",
+        f"youtube calls={youtube.calls}"
+    ]
@@ -0,0 +1,59 @@
+"""
+Text normalization benchmark: cleaning plus the keyword / ATS / NLP scorers on
+1-50 page resumes, with the scorers either sharing one textnorm.normalize()
+result or each normalizing the cleaned string on its own.
+
+spaCy parsing is done once per size outside the timed region (when installed),
+so the numbers isolate the text layer.
+
+Usage:
+    python -m benchmarks.textnorm [--pages 1 5 10 25 50] [--repeat 5]
+"""
+
+import argparse
+import sys
+import timeit
+from typing import List
+
+from benchmarks import corpus
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="GuideFY text normalization benchmark")
+    parser.add_argument("--pages", type=int, nargs="*", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from textnorm import normalize
+    from resume_utils import (preprocess_resume_text, analyze_resume_keywords, calculate_ats_score,
+                              extract_nlp_analysis, get_nlp_model)
+
+    nlp = get_nlp_model()
+    print(f"{'pages':>6}{'chars':>10}{'normalize (ms)':>16}{'separate (ms)':>15}{'shared (ms)':>13}{'speedup':>9}")
+    for pages in args.pages:
+        raw = corpus.resume_text(pages=pages, seed=pages)
+        if nlp:
+            nlp.max_length = max(nlp.max_length, len(raw) + 1)
+        doc = nlp(preprocess_resume_text(raw)) if nlp else None
+
+        def separate():
+            clean = preprocess_resume_text(raw)
+            keywords = analyze_resume_keywords(clean, doc)
+            return calculate_ats_score(clean, keywords), extract_nlp_analysis(clean, doc)
+
+        def shared():
+            norm = normalize(raw)
+            keywords = analyze_resume_keywords(norm, doc)
+            return calculate_ats_score(norm, keywords), extract_nlp_analysis(norm, doc)
+
+        number = max(1, 50 // pages)
+        timings = {}
+        for name, fn in (("normalize", lambda: normalize(raw)), ("separate", separate), ("shared", shared)):
+            timings[name] = min(timeit.repeat(fn, repeat=args.repeat, number=number)) / number * 1e3
+        print(f"{pages:>6}{len(raw):>10}{timings['normalize']:>16.2f}{timings['separate']:>15.2f}"
+              f"{timings['shared']:>13.2f}{timings['separate'] / timings['shared']:>8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
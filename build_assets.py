@@ -0,0 +1,137 @@
+"""
+GuideFY static asset build step.
+
+Fingerprints the CSS/JS under static/, rewrites the HTML pages to reference the
+fingerprinted files, and pre-generates gzip (and brotli, when the `brotli`
+package is installed) variants of everything. Output goes to static/dist/
+together with a manifest.json that assets.py uses to serve the right variant
+with strong ETags and immutable cache headers.
+
+static/dist/ is plain files, so it can also be served directly by a CDN or
+reverse proxy (e.g. nginx `gzip_static on; brotli_static on;`) to keep static
+traffic off the Python workers entirely.
+
+Usage:
+    python build_assets.py
+
+gunicorn.conf.py runs the build at startup (BUILD_ASSETS=0 disables it). The
+Vercel deployment (vercel.json) has no build step that could run it, so there
+the pages fall back to the unbuilt sources in static/.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+
+ASSET_DIRS = ("css", "js")
+PAGES = ("home.html", "guidefy.html", "resume.html")
+
+# Public URL prefix of fingerprinted assets (see assets.ASSET_URL_PREFIX)
+ASSET_URL_PREFIX = "/assets/"
+
+# Skip precompressing tiny files where the encoding overhead outweighs the savings
+MIN_COMPRESS_SIZE = 256
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def etag_for(data: bytes) -> str:
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def write_variants(rel_path: str, data: bytes) -> dict:
+    """
+    Writes `data` to dist/rel_path plus its compressed variants.
+
+    Returns:
+        dict: Manifest entry with the path and ETag of each encoding.
+    """
+    out_path = os.path.join(DIST_DIR, rel_path)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(data)
+
+    entry = {"path": rel_path, "etag": etag_for(data), "size": len(data), "variants": {}}
+    if len(data) < MIN_COMPRESS_SIZE:
+        return entry
+
+    compressed = {"gzip": (gzip.compress(data, compresslevel=9, mtime=0), ".gz")}
+    if brotli is not None:
+        compressed["br"] = (brotli.compress(data, quality=11), ".br")
+
+    for encoding, (blob, suffix) in compressed.items():
+        if len(blob) >= len(data):
+            continue
+        with open(out_path + suffix, "wb") as f:
+            f.write(blob)
+        entry["variants"][encoding] = {"path": rel_path + suffix, "etag": etag_for(blob), "size": len(blob)}
+    return entry
+
+
+def build() -> dict:
+    """Runs the full asset build and returns the manifest."""
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    os.makedirs(DIST_DIR)
+
+    manifest = {"assets": {}, "pages": {}}
+
+    # 1. Fingerprint CSS/JS: css/common.css -> css/common.<hash>.css
+    for subdir in ASSET_DIRS:
+        src_dir = os.path.join(STATIC_DIR, subdir)
+        if not os.path.isdir(src_dir):
+            continue
+        for name in sorted(os.listdir(src_dir)):
+            with open(os.path.join(src_dir, name), "rb") as f:
+                data = f.read()
+            stem, ext = os.path.splitext(name)
+            rel = f"{subdir}/{stem}.{fingerprint(data)}{ext}"
+            manifest["assets"][f"{subdir}/{name}"] = write_variants(rel, data)
+
+    # 2. Rewrite page references (href="css/x.css", src="js/y.js") to the fingerprinted URLs
+    ref_re = re.compile(r'(href|src)="/?((?:%s)/[^"]+)"' % "|".join(ASSET_DIRS))
+
+    def rewrite(match):
+        entry = manifest["assets"].get(match.group(2))
+        if entry is None:
+            return match.group(0)
+        return f'{match.group(1)}="{ASSET_URL_PREFIX}{entry["path"]}"'
+
+    for page in PAGES:
+        with open(os.path.join(STATIC_DIR, page), "r", encoding="utf-8") as f:
+            html = ref_re.sub(rewrite, f.read())
+        manifest["pages"][page] = write_variants(f"pages/{page}", html.encode("utf-8"))
+
+    with open(os.path.join(DIST_DIR, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def main() -> int:
+    manifest = build()
+    for kind in ("assets", "pages"):
+        for name, entry in manifest[kind].items():
+            variants = ", ".join(f"{enc}={v['size']}B" for enc, v in entry["variants"].items()) or "uncompressed only"
+            print(f"{name:<22} -> {entry['path']:<34} {entry['size']}B ({variants})")
+    if brotli is None:
+        print("Note: install 'brotli' to also generate .br variants.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Gunicorn configuration for running GuideFY in production.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Settings can be overridden with environment variables:
+    PORT / GUNICORN_BIND   Listen address (default 0.0.0.0:5050)
+    WEB_CONCURRENCY        Number of worker processes (default 2 x CPUs + 1)
+    GUNICORN_THREADS       Threads per worker (default 4); requests mostly wait on Gemini.
+                           The admission limits in admission.py are sized from this value, so
+                           change the thread count here (not with --threads) to keep them in step.
+    GUNICORN_TIMEOUT       Worker timeout in seconds (default 120)
+    BUILD_ASSETS           1 (default) runs build_assets.py once in the master at startup, so
+                           static/dist/ (gitignored) always matches the deployed sources; set 0
+                           when the image already ships a built static/dist/
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '5050')}")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+# The app is imported after this file, so admission.py sizes its route classes for this value
+os.environ["GUNICORN_THREADS"] = str(threads)
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# Import wsgi.py (and therefore preload()) in the master so workers inherit the loaded models
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    # Runs once in the master, before any worker serves a request; assets.py reads the
+    # manifest lazily, so the preloaded app picks up the fresh build
+    if os.getenv("BUILD_ASSETS", "1").lower() in ("0", "false", "no"):
+        return
+    import build_assets
+    try:
+        build_assets.build()
+    except OSError as e:
+        server.log.warning("Static asset build failed, serving unbuilt files from static/: %s", e)
+
+
+def pre_fork(server, worker):
+    # Move everything loaded so far into the permanent generation so the garbage
+    # collector in the workers never touches (and thereby copies) the shared pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Per-worker resources (Gemini HTTP client, spaCy warm-up) must be created after fork
+    from app import warm_worker
+    warm_worker()
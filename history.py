@@ -0,0 +1,231 @@
+"""
+Persistent, append-only history of /career and /resume-analyze results.
+Results are written to a WAL-mode SQLite database by a background writer
+thread that drains a bounded queue in batches (one transaction per batch),
+so recording a result costs a queue put on the request path. Rows are
+indexed by session and by content hash, which serves a paginated "my past
+analyses" API and lets repeat requests be answered from an earlier result
+in any worker process, even after a restart.
+
+Configuration (environment):
+    HISTORY_ENABLED             1 (default) / 0
+    HISTORY_DB_PATH             Database file (default: guidefy_history.db in the temp directory)
+    HISTORY_BATCH_SIZE          Maximum rows per write transaction (default 500)
+    HISTORY_FLUSH_MS            Maximum time a row waits in the queue (default 200)
+    HISTORY_QUEUE_SIZE          Pending rows before new ones are dropped (default 10000)
+    HISTORY_READ_THROUGH_TTL    Seconds a stored result may answer a repeat request, 0 = off (default 86400)
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from logs import error_fields, get_logger
+from sqlitedb import LocalConnection
+
+log = get_logger("history")
+
+
+def content_hash(obj: Any) -> str:
+    """Stable hash of a JSON-serializable request, used to find repeats."""
+    data = json.dumps(obj, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class HistoryStore:
+    """
+    Args:
+        path (str): SQLite database file.
+        batch_size (int): Maximum rows written per transaction.
+        flush_interval (float): Seconds the writer waits to fill a batch.
+        max_queue (int): Pending rows; record() drops (and counts) rows beyond this instead of blocking.
+        read_through_ttl (float): Maximum age in seconds of a result returned by lookup(); 0 disables it.
+        enabled (bool): When False nothing is recorded and lookups miss.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY,
+            created REAL NOT NULL,
+            kind TEXT NOT NULL,
+            source TEXT NOT NULL,
+            session TEXT,
+            content_hash TEXT NOT NULL,
+            request TEXT NOT NULL,
+            result TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS history_session ON history (session, kind, id);
+        CREATE INDEX IF NOT EXISTS history_content ON history (kind, content_hash, id);
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 0.2,
+                 max_queue: int = 10_000, read_through_ttl: float = 86400, enabled: bool = True):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.0, flush_interval)
+        self.max_queue = max(1, max_queue)
+        self.read_through_ttl = read_through_ttl
+        self.enabled = enabled
+        self._db = LocalConnection(path, self.SCHEMA)
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._drained = threading.Condition(self._stats_lock)
+        self._pending = 0
+        self.stats = {"queued": 0, "written": 0, "dropped": 0, "batches": 0, "write_errors": 0}
+
+    @classmethod
+    def from_env(cls) -> "HistoryStore":
+        path = os.getenv("HISTORY_DB_PATH") or os.path.join(tempfile.gettempdir(), "guidefy_history.db")
+        return cls(
+            path=path,
+            batch_size=int(os.getenv("HISTORY_BATCH_SIZE", "500")),
+            flush_interval=float(os.getenv("HISTORY_FLUSH_MS", "200")) / 1000,
+            max_queue=int(os.getenv("HISTORY_QUEUE_SIZE", "10000")),
+            read_through_ttl=float(os.getenv("HISTORY_READ_THROUGH_TTL", "86400")),
+            enabled=os.getenv("HISTORY_ENABLED", "1").lower() not in ("0", "false", "no")
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def _ensure_started(self) -> None:
+        # Threads don't survive fork, so each (gunicorn worker) process starts its own writer
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._pending = 0
+            threading.Thread(target=self._write_loop, name="history-writer", daemon=True).start()
+            atexit.register(self.flush)
+            self._pid = os.getpid()
+
+    def record(self, kind: str, source: str, session: Optional[str], request_hash: str,
+               request: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """
+        Queues one result for writing; never blocks. Serialization happens on the writer thread,
+        so `request` and `result` must not be mutated afterwards.
+
+        Args:
+            kind (str): "career" or "resume".
+            source (str): Where the result came from, e.g. "llm", "cache", "local", "fallback".
+            session (str, optional): Client-chosen session id (X-Session-Id).
+            request_hash (str): content_hash() of the request, for repeat lookups.
+            request (dict): Request summary to store.
+            result (dict): Response payload.
+        """
+        if not self.enabled:
+            return
+        self._ensure_started()
+        with self._stats_lock:
+            self._pending += 1
+            self.stats["queued"] += 1
+        try:
+            self._queue.put_nowait((time.time(), kind, source, session, request_hash, request, result))
+        except queue.Full:
+            with self._stats_lock:
+                self._pending -= 1
+                self.stats["queued"] -= 1
+                self.stats["dropped"] += 1
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+            with self._drained:
+                self._pending -= len(batch)
+                self._drained.notify_all()
+
+    def _write(self, batch: List[tuple]) -> None:
+        conn = self._conn()
+        try:
+            rows = [
+                (created, kind, source, session, request_hash, json.dumps(request, default=str), json.dumps(result, default=str))
+                for created, kind, source, session, request_hash, request, result in batch
+            ]
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO history (created, kind, source, session, content_hash, request, result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            log.error("History write failed", extra={"event": "history_write_error", "rows": len(batch), **error_fields(e)})
+            with self._stats_lock:
+                self.stats["write_errors"] += len(batch)
+            return
+        with self._stats_lock:
+            self.stats["written"] += len(rows)
+            self.stats["batches"] += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Waits until every queued row has been written; returns False on timeout."""
+        if not self.enabled or self._pid != os.getpid():
+            return True
+        with self._drained:
+            return self._drained.wait_for(lambda: self._pending <= 0, timeout)
+
+    def lookup(self, kind: str, request_hash: str, sources=("llm",)) -> Optional[Dict[str, Any]]:
+        """
+        Read-through for repeat requests: the newest stored result for this request that is
+        younger than the TTL and came from one of `sources`, or None.
+        """
+        if not self.enabled or self.read_through_ttl <= 0:
+            return None
+        placeholders = ",".join("?" * len(sources))
+        row = self._conn().execute(
+            f"SELECT result FROM history WHERE kind = ? AND content_hash = ? AND created >= ? "
+            f"AND source IN ({placeholders}) ORDER BY id DESC LIMIT 1",
+            (kind, request_hash, time.time() - self.read_through_ttl, *sources)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def page(self, session: str, kind: Optional[str] = None, limit: int = 20,
+             before: Optional[int] = None) -> Dict[str, Any]:
+        """
+        One page of a session's history, newest first (keyset pagination on the row id).
+
+        Returns:
+            dict: "items" and "next_before", the value to pass as `before` for the next page
+                  (None on the last page).
+        """
+        if not self.enabled:
+            return {"items": [], "next_before": None}
+        limit = max(1, min(limit, 100))
+        query = "SELECT id, created, kind, source, request, result FROM history WHERE session = ?"
+        params: List[Any] = [session]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        if before is not None:
+            query += " AND id < ?"
+            params.append(before)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        rows = self._conn().execute(query, params).fetchall()
+        items = [
+            {"id": row_id, "created": created, "kind": row_kind, "source": source,
+             "request": json.loads(request), "result": json.loads(result)}
+            for row_id, created, row_kind, source, request, result in rows[:limit]
+        ]
+        return {"items": items, "next_before": items[-1]["id"] if len(rows) > limit else None}
+
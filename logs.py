@@ -0,0 +1,205 @@
+"""
+Structured, non-blocking logging for GuideFY.
+Request threads only put log records on an in-memory queue (QueueHandler); a
+background QueueListener thread formats them as one JSON object per line and
+writes them to stdout, so a slow stdout pipe can no longer block workers.
+Every record carries the id of the request that emitted it, and each request
+ends with one "request" record holding its status, total duration and
+per-stage durations (see stage()).
+
+Configuration (environment):
+    LOG_LEVEL         DEBUG / INFO (default) / WARNING / ERROR
+    LOG_SAMPLE_RATES  Fraction of records kept per event, e.g. "request=0.1,semantic_cache_hit=0.01"
+                      (default: keep everything). Warnings, errors, 5xx and slow requests are always kept.
+    LOG_SLOW_MS       Requests slower than this are always logged (default 1000)
+    LOG_QUEUE_SIZE    Records buffered for the writer before new ones are dropped (default 10000)
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict
+
+from flask import g, has_request_context, request
+
+REQUEST_ID_HEADER = "X-Request-Id"
+
+# Attributes every LogRecord has; anything else was passed through `extra` and is emitted as a field
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName", "force"}
+
+
+def _parse_rates(spec: str) -> Dict[str, float]:
+    rates = {}
+    for item in spec.split(","):
+        event, _, value = item.partition("=")
+        try:
+            rates[event.strip()] = min(1.0, max(0.0, float(value)))
+        except ValueError:
+            continue
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: timestamp, level, logger, message, request id and extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _ContextFilter(logging.Filter):
+    """Adds the request id and applies per-event sampling, on the emitting thread."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING and not getattr(record, "force", False):
+            rate = self.rates.get(getattr(record, "event", None), 1.0)
+            if rate < 1.0 and random.random() >= rate:
+                return False
+        record.request_id = g.get("request_id") if has_request_context() else None
+        return True
+
+
+class _AsyncHandler(QueueHandler):
+    """
+    QueueHandler that starts its writer thread on first use in each process (threads don't
+    survive a gunicorn fork) and drops records instead of blocking when the queue is full.
+    """
+
+    def __init__(self, target: logging.Handler, max_queue: int):
+        super().__init__(queue.Queue(maxsize=max_queue))
+        self.target = target
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_listener(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.Queue(maxsize=self.max_queue)
+            listener = QueueListener(self.queue, self.target)
+            listener.start()
+            atexit.register(listener.stop)
+            self._pid = os.getpid()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render tracebacks now (they reference live objects); JSON encoding
+        # is left to the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._ensure_listener()
+        super().emit(record)
+
+
+_configure_lock = threading.Lock()
+_handler = None
+
+
+def configure() -> None:
+    """Installs the queue handler and JSON writer on the "guidefy" logger (once per process)."""
+    global _handler
+    with _configure_lock:
+        if _handler is not None:
+            return
+        target = logging.StreamHandler(sys.stdout)
+        target.setFormatter(JsonFormatter())
+        _handler = _AsyncHandler(target, int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+        _handler.addFilter(_ContextFilter(_parse_rates(os.getenv("LOG_SAMPLE_RATES", ""))))
+
+        root = logging.getLogger("guidefy")
+        root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        root.addHandler(_handler)
+        root.propagate = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Returns a logger under the "guidefy" namespace, e.g. get_logger("app")."""
+    configure()
+    return logging.getLogger(f"guidefy.{name}")
+
+
+def error_fields(error: BaseException, limit: int = 300) -> Dict[str, Any]:
+    """Exception type and a truncated message, for `extra` (full strings can be huge or hold prompt text)."""
+    message = str(error)
+    return {"error_type": type(error).__name__, "error": message[:limit] + ("..." if len(message) > limit else "")}
+
+
+@contextmanager
+def stage(name: str):
+    """Times a block and adds it to the current request's per-stage durations (milliseconds)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_request_context() and "log_stages" in g:
+            elapsed = (time.perf_counter() - start) * 1000
+            g.log_stages[name] = round(g.log_stages.get(name, 0.0) + elapsed, 2)
+
+
+def init_app(app) -> None:
+    """Assigns request ids and logs one sampled "request" record per request."""
+    log = get_logger("request")
+    slow_ms = float(os.getenv("LOG_SLOW_MS", "1000"))
+
+    @app.before_request
+    def _start_request():
+        incoming = request.headers.get(REQUEST_ID_HEADER, "")
+        valid = 0 < len(incoming) <= 64 and incoming.replace("-", "").isalnum()
+        g.request_id = incoming if valid else uuid.uuid4().hex[:16]
+        g.request_start = time.perf_counter()
+        g.log_stages = {}
+
+    @app.after_request
+    def _finish_request(response):
+        if "request_start" not in g:
+            return response
+        duration_ms = round((time.perf_counter() - g.request_start) * 1000, 2)
+        response.headers[REQUEST_ID_HEADER] = g.request_id
+        log.info("request", extra={
+            "event": "request",
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": duration_ms,
+            "stages": g.log_stages,
+            "force": response.status_code >= 500 or duration_ms >= slow_ms
+        })
+        return response
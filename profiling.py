@@ -0,0 +1,207 @@
+"""
+Opt-in per-request profiling for GuideFY.
+Captures a cProfile profile for selected requests on the expensive routes
+(/career, /resume-analyze) and keeps the most recent ones in a rotating
+on-disk store that can be downloaded from an admin endpoint.
+
+Configuration (environment):
+    PROFILE_TOKEN        Shared secret. Enables the admin endpoints and lets a
+                         request opt in by sending it in the X-Profile-Token header.
+    PROFILE_SAMPLE_RATE  Fraction (0-1) of requests profiled automatically. Default 0.
+    PROFILE_DIR          Directory for stored profiles. Default <tmp>/guidefy_profiles.
+    PROFILE_MAX_FILES    Number of profiles kept before the oldest are deleted. Default 50.
+"""
+
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import tempfile
+import threading
+import time
+import uuid
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+from flask import abort, jsonify, make_response, request, send_from_directory
+
+PROFILE_HEADER = "X-Profile-Token"
+PROFILE_NAME_RE = re.compile(r"^[\w.-]+\.prof$")
+
+
+class ProfileStore:
+    """
+    Rotating directory of cProfile dumps.
+
+    Args:
+        directory (str): Where profiles are written.
+        max_files (int): Number of profiles kept; older ones are deleted on save.
+    """
+
+    def __init__(self, directory: str, max_files: int = 50):
+        self.directory = directory
+        self.max_files = max(1, max_files)
+        self._lock = threading.Lock()
+
+    def save(self, profiler: cProfile.Profile, route: str, duration: float) -> str:
+        """Writes a profile to disk, rotates old files and returns its name."""
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}_{route}_{int(duration * 1000)}ms_{uuid.uuid4().hex[:8]}.prof"
+        profiler.dump_stats(os.path.join(self.directory, name))
+        self._rotate()
+        return name
+
+    def _rotate(self) -> None:
+        with self._lock:
+            profiles = self.list()
+            for entry in profiles[self.max_files:]:
+                try:
+                    os.remove(os.path.join(self.directory, entry["name"]))
+                except OSError:
+                    pass
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Returns stored profiles, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        stamped = []
+        for name in os.listdir(self.directory):
+            if not PROFILE_NAME_RE.match(name):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            stamped.append((st.st_mtime_ns, name, {"name": name, "size": st.st_size, "created": int(st.st_mtime)}))
+        # Whole seconds can't order profiles saved within the same second, so sort on nanoseconds
+        stamped.sort(key=lambda item: item[:2], reverse=True)
+        return [entry for _, _, entry in stamped]
+
+    def exists(self, name: str) -> bool:
+        return bool(PROFILE_NAME_RE.match(name)) and os.path.isfile(os.path.join(self.directory, name))
+
+    def summary(self, name: str, limit: int = 40) -> str:
+        """Renders a stored profile as a pstats text report sorted by cumulative time."""
+        out = io.StringIO()
+        stats = pstats.Stats(os.path.join(self.directory, name), stream=out)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and runs them under cProfile.
+    Only one request is profiled at a time per process, since the
+    interpreter allows a single active profiler.
+    """
+
+    def __init__(self, token: Optional[str] = None, sample_rate: float = 0.0, store: Optional[ProfileStore] = None):
+        self.token = token
+        self.sample_rate = sample_rate
+        self.store = store or ProfileStore(os.path.join(tempfile.gettempdir(), "guidefy_profiles"))
+        self._active = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RequestProfiler":
+        try:
+            sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        except ValueError:
+            sample_rate = 0.0
+        try:
+            max_files = int(os.getenv("PROFILE_MAX_FILES", "50"))
+        except ValueError:
+            max_files = 50
+        directory = os.getenv("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "guidefy_profiles")
+        return cls(
+            token=os.getenv("PROFILE_TOKEN") or None,
+            sample_rate=min(max(sample_rate, 0.0), 1.0),
+            store=ProfileStore(directory, max_files)
+        )
+
+    def authorized(self, supplied: Optional[str]) -> bool:
+        return bool(self.token) and bool(supplied) and hmac.compare_digest(self.token, supplied)
+
+    def wanted(self) -> bool:
+        """True if the current request opted in via header or was sampled."""
+        if self.authorized(request.headers.get(PROFILE_HEADER)):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def profiled(self, route: str):
+        """Decorator profiling a view function when `wanted()` says so."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.wanted() or not self._active.acquire(blocking=False):
+                    return view(*args, **kwargs)
+
+                profiler = cProfile.Profile()
+                start = time.perf_counter()
+                try:
+                    profiler.enable()
+                    try:
+                        rv = view(*args, **kwargs)
+                    finally:
+                        profiler.disable()
+                    duration = time.perf_counter() - start
+                    name = self.store.save(profiler, route, duration)
+                finally:
+                    self._active.release()
+
+                response = make_response(rv)
+                response.headers["X-Profile-Id"] = name
+                return response
+            return wrapper
+        return decorator
+
+
+# Process-wide profiler; reconfigured from the environment by init_app()
+PROFILER = RequestProfiler()
+
+
+def _require_token() -> None:
+    # Header only: a query-string token would end up in the access log
+    supplied = request.headers.get(PROFILE_HEADER)
+    if not PROFILER.token:
+        abort(404)
+    if not PROFILER.authorized(supplied):
+        abort(403)
+
+
+def list_profiles():
+    """Admin endpoint listing stored profiles, newest first."""
+    _require_token()
+    return jsonify({"profiles": PROFILER.store.list(), "sample_rate": PROFILER.sample_rate})
+
+
+def download_profile(name: str):
+    """
+    Admin endpoint returning one stored profile.
+    Serves the raw .prof file (for snakeviz / pstats), or a text summary with ?format=text.
+    """
+    _require_token()
+    if not PROFILER.store.exists(name):
+        abort(404)
+    if request.args.get("format") == "text":
+        response = make_response(PROFILER.store.summary(name))
+        response.mimetype = "text/plain"
+        return response
+    return send_from_directory(PROFILER.store.directory, name, as_attachment=True)
+
+
+def init_app(app) -> RequestProfiler:
+    """
+    Configures the process profiler from the environment and registers the
+    admin endpoints on the Flask app.
+    """
+    configured = RequestProfiler.from_env()
+    PROFILER.token = configured.token
+    PROFILER.sample_rate = configured.sample_rate
+    PROFILER.store = configured.store
+
+    app.add_url_rule("/admin/profiles", "list_profiles", list_profiles)
+    app.add_url_rule("/admin/profiles/<name>", "download_profile", download_profile)
+    return PROFILER
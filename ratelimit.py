@@ -0,0 +1,250 @@
+"""
+Per-client rate limiting and LLM quota accounting for GuideFY.
+A token bucket keyed by a configured API key (X-API-Key) or the client IP limits how fast one
+client can hit the expensive routes, and a per-client daily counter caps how
+many Gemini calls it may trigger; past the quota it gets the deterministic
+(non-LLM) results instead, so one script can no longer burn the shared quota.
+
+Backends:
+    MemoryBackend  Per process, a dict lookup per request (microseconds).
+    SQLiteBackend  Shared by all workers on a host through one WAL-mode SQLite file.
+
+Configuration (environment):
+    RATE_LIMIT_ENABLED       1 (default) / 0
+    RATE_LIMIT_BACKEND       memory (default) or sqlite
+    RATE_LIMIT_SQLITE_PATH   Database file for the sqlite backend
+    RATE_LIMIT_RATE          Sustained requests per second per client (default 1)
+    RATE_LIMIT_BURST         Bucket size, i.e. allowed burst (default 10)
+    RATE_LIMIT_API_KEYS      Comma-separated API keys that get their own bucket and quota; any other
+                             X-API-Key value is ignored and the caller is keyed on its IP
+    RATE_LIMIT_TRUST_PROXY   Number of reverse proxies in front of the app (behind Vercel/nginx: 1). The
+                             client IP is the X-Forwarded-For entry the outermost trusted proxy appended,
+                             not the leftmost one, which the client controls (default 0: socket peer)
+    LLM_DAILY_QUOTA          Gemini calls per client per UTC day, 0 = unlimited (default 200)
+
+Both backends drop fully refilled buckets and past days' quota counters at most once per
+`prune_interval` seconds, from inside consume(), so their size tracks the recently active clients.
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from functools import wraps
+from typing import Optional, Tuple
+
+from flask import jsonify, request
+
+from sqlitedb import LocalConnection
+
+
+def _hash_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def _parse_hops(value: str) -> int:
+    # Accepts a hop count; the older boolean spellings mean one proxy
+    value = value.strip().lower()
+    if value in ("true", "yes"):
+        return 1
+    try:
+        return max(0, int(value))
+    except ValueError:
+        return 0
+
+
+def _today() -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime())
+
+
+class MemoryBackend:
+    """In-process token buckets and daily counters."""
+
+    def __init__(self, max_keys: int = 100_000, prune_interval: float = 60.0):
+        self.max_keys = max_keys
+        self.prune_interval = prune_interval
+        self._buckets = {}
+        self._quotas = {}
+        self._lock = threading.Lock()
+        self._last_prune = time.monotonic()
+
+    def consume(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Takes `cost` tokens from `key`'s bucket.
+
+        Returns:
+            tuple: (allowed, seconds until enough tokens are available).
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys or now - self._last_prune >= self.prune_interval:
+                self._prune(now, rate, burst)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+    def _prune(self, now: float, rate: float, burst: float) -> None:
+        self._last_prune = now
+        # Buckets that have refilled completely carry no state worth keeping
+        for key, (tokens, updated) in list(self._buckets.items()):
+            if tokens + (now - updated) * rate >= burst:
+                del self._buckets[key]
+        today = _today()
+        for quota_key in [k for k in self._quotas if k[1] != today]:
+            del self._quotas[quota_key]
+
+    def take_quota(self, key: str, limit: int) -> bool:
+        """Counts one LLM call for `key` today; False once `limit` calls have been made."""
+        quota_key = (key, _today())
+        with self._lock:
+            used = self._quotas.get(quota_key, 0)
+            if used >= limit:
+                return False
+            self._quotas[quota_key] = used + 1
+            return True
+
+
+class SQLiteBackend:
+    """
+    Token buckets and daily counters in a shared SQLite database, so every worker
+    process on the host enforces the same limits. Each check is one short
+    BEGIN IMMEDIATE transaction.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL);
+        CREATE TABLE IF NOT EXISTS llm_quota (key TEXT NOT NULL, day TEXT NOT NULL, used INTEGER NOT NULL,
+                                              PRIMARY KEY (key, day));
+    """
+
+    def __init__(self, path: str, prune_interval: float = 60.0):
+        self.path = path
+        self.prune_interval = prune_interval
+        self._db = LocalConnection(path, self.SCHEMA)
+        self._prune_lock = threading.Lock()
+        self._last_prune = time.time()
+
+    def _conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def consume(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (burst, now)
+            tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)", (key, tokens, now))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if now - self._last_prune >= self.prune_interval:
+            self._prune(conn, now, rate, burst)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+    def _prune(self, conn: sqlite3.Connection, now: float, rate: float, burst: float) -> None:
+        # One thread per process does the cleanup; other workers may repeat it, which is harmless
+        if not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_prune = now
+            conn.execute("DELETE FROM buckets WHERE tokens + (? - updated) * ? >= ?", (now, rate, burst))
+            conn.execute("DELETE FROM llm_quota WHERE day < ?", (_today(),))
+        finally:
+            self._prune_lock.release()
+
+    def take_quota(self, key: str, limit: int) -> bool:
+        conn = self._conn()
+        cur = conn.execute(
+            "INSERT INTO llm_quota (key, day, used) VALUES (?, ?, 1) "
+            "ON CONFLICT (key, day) DO UPDATE SET used = used + 1 WHERE used < ?",
+            (key, _today(), limit)
+        )
+        return cur.rowcount == 1
+
+
+class RateLimiter:
+    """
+    Args:
+        backend: MemoryBackend or SQLiteBackend.
+        rate (float): Sustained requests per second per client.
+        burst (float): Bucket capacity.
+        daily_llm_quota (int): LLM calls per client per day; 0 disables the quota.
+        trust_proxy (int): Number of trusted reverse proxies; the client IP is taken from the
+            X-Forwarded-For entry added by the outermost one instead of the socket peer.
+        api_keys (iterable, optional): Valid API keys. Only these get a per-key bucket.
+        enabled (bool): When False every check passes.
+    """
+
+    def __init__(self, backend=None, rate: float = 1.0, burst: float = 10, daily_llm_quota: int = 200,
+                 trust_proxy: int = 0, api_keys=None, enabled: bool = True):
+        self.backend = backend or MemoryBackend()
+        self.rate = rate
+        self.burst = burst
+        self.daily_llm_quota = daily_llm_quota
+        self.trust_proxy = int(trust_proxy)
+        self._api_keys = {_hash_key(key) for key in (api_keys or ()) if key}
+        self.enabled = enabled
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        if os.getenv("RATE_LIMIT_BACKEND", "memory").lower() == "sqlite":
+            path = os.getenv("RATE_LIMIT_SQLITE_PATH") or os.path.join(tempfile.gettempdir(), "guidefy_ratelimit.db")
+            backend = SQLiteBackend(path)
+        else:
+            backend = MemoryBackend()
+        return cls(
+            backend=backend,
+            rate=float(os.getenv("RATE_LIMIT_RATE", "1")),
+            burst=float(os.getenv("RATE_LIMIT_BURST", "10")),
+            daily_llm_quota=int(os.getenv("LLM_DAILY_QUOTA", "200")),
+            trust_proxy=_parse_hops(os.getenv("RATE_LIMIT_TRUST_PROXY", "0")),
+            api_keys=[key.strip() for key in os.getenv("RATE_LIMIT_API_KEYS", "").split(",")],
+            enabled=os.getenv("RATE_LIMIT_ENABLED", "1").lower() not in ("0", "false", "no")
+        )
+
+    def client_key(self) -> str:
+        """Identifies the caller by hashed API key if it is a configured one, else by its IP address."""
+        api_key = request.headers.get("X-API-Key")
+        if api_key and self._api_keys:
+            hashed = _hash_key(api_key)
+            if hashed in self._api_keys:
+                return "key:" + hashed[:16]
+        if self.trust_proxy and "X-Forwarded-For" in request.headers:
+            # Each trusted proxy appends the address it saw; entries left of those are client-supplied
+            route = request.access_route
+            if len(route) >= self.trust_proxy:
+                return "ip:" + route[-self.trust_proxy]
+        return "ip:" + (request.remote_addr or "unknown")
+
+    def allow_llm_call(self) -> bool:
+        """Counts one Gemini call against the current client's daily quota."""
+        if not self.enabled or self.daily_llm_quota <= 0:
+            return True
+        return self.backend.take_quota(self.client_key(), self.daily_llm_quota)
+
+    def limited(self, view):
+        """Decorator answering 429 + Retry-After when the client's bucket is empty."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if self.enabled:
+                allowed, retry_after = self.backend.consume(self.client_key(), self.rate, self.burst)
+                if not allowed:
+                    response = jsonify({"error": "Too many requests. Please slow down."})
+                    response.status_code = 429
+                    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+                    return response
+            return view(*args, **kwargs)
+        return wrapper
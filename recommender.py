@@ -0,0 +1,211 @@
+"""
+Deterministic local career recommendation engine.
+Scores the careers and courses in data/career_catalog.json against the user's
+inputs and the spaCy features extracted in career(), producing a response in
+the same structure the LLM returns. It is CPU-only and runs in a few
+milliseconds, so it serves both as the degraded mode when Gemini is down or
+over quota and as an instant preview tier.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from logs import error_fields, get_logger
+from utils import detect_field
+from semantic_cache import tokenize
+
+log = get_logger("recommender")
+
+_catalog = None
+
+
+def load_career_catalog() -> Dict[str, Any]:
+    """
+    Loads the career/course catalog from the JSON file.
+
+    Returns:
+        dict: Catalog keyed by career field, or an empty dict if loading fails.
+    """
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    file_path = os.path.join(base_path, "data", "career_catalog.json")
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        log.error("Failed to load career catalog", extra=error_fields(e))
+        return {}
+
+
+def get_career_catalog() -> Dict[str, Any]:
+    """Returns the catalog, loading it once per process."""
+    global _catalog
+    if _catalog is None:
+        _catalog = load_career_catalog()
+    return _catalog
+
+
+def _user_terms(text: str, lemmas: Iterable[str]) -> set:
+    terms = set(tokenize(text))
+    terms.update(l.lower() for l in lemmas if l)
+    # Cheap plural folding so "databases" matches "database"
+    terms.update(t[:-1] for t in list(terms) if len(t) > 3 and t.endswith("s"))
+    return terms
+
+
+def _matches(phrase: str, terms: set, text_lower: str) -> bool:
+    return phrase in terms if " " not in phrase else phrase in text_lower
+
+
+def _title(phrase: str) -> str:
+    return phrase if phrase.isupper() else phrase.title()
+
+
+def recommend(interests: str, career_goal: str, strengths: str, preferred_subjects: str,
+              verbs: Iterable[str] = (), nouns: Iterable[str] = (), adjectives: Iterable[str] = (),
+              catalog: Optional[Dict[str, Any]] = None, top_n: int = 3) -> Dict[str, Any]:
+    """
+    Builds a recommendation for one user without calling the LLM.
+
+    Args:
+        interests, career_goal, strengths, preferred_subjects: The raw form inputs.
+        verbs, nouns, adjectives: spaCy lemmas extracted in career(), if available.
+        catalog (dict, optional): Catalog to use; the bundled one is loaded if None.
+        top_n (int): Number of careers and courses to return.
+
+    Returns:
+        dict: careers, courses, next_steps, confidence_score, skill_gap_analysis and
+              keywords_found, ready for utils.normalize_output().
+    """
+    catalog = catalog if catalog is not None else get_career_catalog()
+    user_text = f"{interests} {career_goal} {strengths} {preferred_subjects}"
+    text_lower = user_text.lower()
+    goal_lower = career_goal.lower()
+    terms = _user_terms(user_text, list(verbs) + list(nouns) + list(adjectives))
+
+    field = detect_field(user_text)
+    section = catalog.get(field) or catalog.get("generic", {})
+
+    # 1. Score careers: skill overlap, trait overlap and an explicit mention in the goal
+    scored = []
+    for rank, career in enumerate(section.get("careers", [])):
+        skill_hits = [s for s in career["skills"] if _matches(s, terms, text_lower)]
+        trait_hits = [t for t in career.get("traits", []) if _matches(t, terms, text_lower)]
+        name_words = [w for w in tokenize(career["name"]) if len(w) > 3]
+        named = any(w in goal_lower for w in name_words)
+        score = 3 * len(skill_hits) + 2 * len(trait_hits) + (5 if named else 0) - 0.1 * rank
+        scored.append((score, career, skill_hits, trait_hits))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    top = scored[:top_n]
+
+    careers = []
+    matched_skills, matched_traits, missing = [], [], []
+    for score, career, skill_hits, trait_hits in top:
+        justification = career["justification"]
+        if skill_hits or trait_hits:
+            justification += f" It builds on your {', '.join(skill_hits + trait_hits)}."
+        careers.append({"name": career["name"], "justification": justification})
+        matched_skills += [s for s in skill_hits if s not in matched_skills]
+        matched_traits += [t for t in trait_hits if t not in matched_traits]
+    for _, career, skill_hits, _ in top[:2]:
+        missing += [s for s in career["skills"] if s not in skill_hits and s not in missing]
+    missing = missing[:5]
+
+    # 2. Courses that close the most skill gaps first, then reinforce matched skills
+    def course_score(course):
+        skills = course.get("skills", [])
+        return 2 * sum(1 for s in skills if s in missing) + sum(1 for s in skills if s in matched_skills)
+
+    courses = sorted(section.get("courses", []), key=course_score, reverse=True)[:top_n]
+
+    # 3. Deterministic confidence factors (normalize_output recomputes skill_relevance)
+    best = top[0][0] if top else 0
+    input_quality = min(95, 35 + 5 * len(terms))
+    alignment = max(30, min(95, int(45 + 8 * best)))
+    feasibility = 70 if field != "generic" else 55
+
+    return {
+        "careers": careers,
+        "courses": [{"name": c["name"], "description": c["description"]} for c in courses],
+        "next_steps": list(section.get("next_steps", [])),
+        "confidence_score": {
+            "overall": 0,
+            "breakdown": {
+                "input_detail_quality": input_quality,
+                "skill_relevance": 50,
+                "career_alignment": alignment,
+                "feasibility": feasibility
+            },
+            "explanation": (
+                f"Instant estimate from your inputs matched against the {field.replace('_', '/')} career catalog"
+                f" ({len(matched_skills)} matching skills, {len(matched_traits)} matching traits)."
+            )
+        },
+        "skill_gap_analysis": {"missing_skills": [_title(s) for s in missing]},
+        "keywords_found": [_title(k) for k in matched_skills + matched_traits]
+    }
+
+
+def shared_blocks(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Strips an LLM recommendation down to the parts that can be served to another user with
+    similar inputs (see semantic_cache): careers, courses, next steps and the confidence
+    factors. The matched and missing skills are pooled without recording which were which,
+    since that split describes the original user's inputs.
+
+    Args:
+        raw (dict): Parsed LLM output.
+
+    Returns:
+        dict: A payload for personalize() to complete per request.
+    """
+    confidence_score = raw.get("confidence_score", {})
+    breakdown = confidence_score.get("breakdown", {}) if isinstance(confidence_score, dict) else {}
+    skill_gap_analysis = raw.get("skill_gap_analysis", {})
+    missing = skill_gap_analysis.get("missing_skills", []) if isinstance(skill_gap_analysis, dict) else []
+    skills = []
+    for skill in list(raw.get("keywords_found", [])) + list(missing):
+        if isinstance(skill, str) and skill.strip() and skill not in skills:
+            skills.append(skill)
+    return {
+        "careers": raw.get("careers", []),
+        "courses": raw.get("courses", []),
+        "next_steps": raw.get("next_steps", []),
+        "breakdown": dict(breakdown) if isinstance(breakdown, dict) else {},
+        "skills": skills
+    }
+
+
+def personalize(shared: Dict[str, Any], user_text: str, lemmas: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Completes a shared_blocks() payload for the current user: each pooled skill the user's
+    inputs mention becomes a keyword found, the rest are the skill gaps.
+
+    Args:
+        shared (dict): Output of shared_blocks().
+        user_text (str): The current user's concatenated inputs.
+        lemmas: spaCy lemmas extracted from the current inputs, if available.
+
+    Returns:
+        dict: A response in the LLM's structure, ready for utils.normalize_output().
+    """
+    text_lower = user_text.lower()
+    terms = _user_terms(user_text, lemmas)
+    found, missing = [], []
+    for skill in shared.get("skills", []):
+        (found if _matches(skill.lower(), terms, text_lower) else missing).append(skill)
+    return {
+        "careers": shared.get("careers", []),
+        "courses": shared.get("courses", []),
+        "next_steps": shared.get("next_steps", []),
+        "confidence_score": {
+            "overall": 0,
+            "breakdown": dict(shared.get("breakdown", {})),
+            "explanation": (
+                f"Reused from a recommendation for closely matching inputs"
+                f" ({len(found)} of your skills match its career paths)."
+            )
+        },
+        "skill_gap_analysis": {"missing_skills": missing},
+        "keywords_found": found
+    }
@@ -0,0 +1,167 @@
+"""
+Compact JSON responses for the GuideFY API.
+Payloads are serialized with orjson when it is installed (stdlib json with
+compact separators otherwise), compressed with brotli or gzip when the client
+accepts it and the body is large enough to benefit, and can be trimmed with a
+`fields` query parameter so the frontend skips blocks it already has cached:
+
+    ?fields=recommendation.careers,recommendation.upskill    only these paths
+    ?fields=-recommendation.upskill.platforms                everything except this path
+
+Paths are dotted keys from the top of the payload; a path that crosses a list
+applies to each of its items. Static blocks carry ETags (see block_etag()) so a
+client can tell whether its cached copy is still current.
+
+Configuration (environment):
+    API_COMPRESSION          1 (default) / 0
+    API_COMPRESS_MIN_BYTES   Smaller bodies are sent uncompressed (default 1024)
+    API_GZIP_LEVEL           gzip level, 1-9 (default 5)
+    API_BROTLI_QUALITY       brotli quality, 0-11 (default 4)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, List, Optional
+
+from flask import Response, request
+
+from assets import choose_encoding, etag_matches
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv("API_COMPRESSION", "1").lower() not in ("0", "false", "no")
+COMPRESS_MIN_BYTES = int(os.getenv("API_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("API_GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("API_BROTLI_QUALITY", "4"))
+
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+FIELDS_PARAM = "fields"
+
+
+def dumps(obj: Any) -> bytes:
+    """Serializes `obj` to compact UTF-8 JSON; values JSON can't represent are converted with str()."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def block_etag(obj: Any) -> str:
+    """Strong ETag of a JSON-serializable block, e.g. the platforms of an upskill field."""
+    return '"' + hashlib.blake2b(dumps(obj), digest_size=8).hexdigest() + '"'
+
+
+def _parse_fields(spec: str):
+    include, exclude = [], []
+    for item in spec.split(","):
+        item = item.strip()
+        if item.startswith("-"):
+            path = item[1:].strip()
+            if path:
+                exclude.append(path.split("."))
+        elif item:
+            include.append(item.split("."))
+    return include, exclude
+
+
+def _include(value: Any, paths: List[List[str]]) -> Any:
+    if any(not path for path in paths):
+        return value
+    if isinstance(value, list):
+        return [_include(item, paths) for item in value]
+    if not isinstance(value, dict):
+        return value
+    children = {}
+    for key, *rest in paths:
+        if key in value:
+            children.setdefault(key, []).append(rest)
+    return {key: _include(value[key], rest) for key, rest in children.items()}
+
+
+def _exclude(value: Any, path: List[str]) -> Any:
+    # Copies only the containers along the path, so the caller's payload is left untouched
+    if isinstance(value, list):
+        return [_exclude(item, path) for item in value]
+    if not isinstance(value, dict) or path[0] not in value:
+        return value
+    key, rest = path[0], path[1:]
+    trimmed = dict(value)
+    if rest:
+        trimmed[key] = _exclude(value[key], rest)
+    else:
+        del trimmed[key]
+    return trimmed
+
+
+def select_fields(payload: Any, spec: Optional[str]) -> Any:
+    """
+    Applies a `fields` specification (see the module docstring) to a payload.
+    The payload itself is never modified; unknown paths are ignored.
+    """
+    if not spec:
+        return payload
+    include, exclude = _parse_fields(spec)
+    if include:
+        payload = _include(payload, include)
+    for path in exclude:
+        payload = _exclude(payload, path)
+    return payload
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compresses a response body with "br" or "gzip" (tuned for speed, not maximum ratio)."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def api_json(payload: Any, etag: bool = False, cache_control: Optional[str] = None) -> Response:
+    """
+    Drop-in replacement for jsonify() on API routes: applies the request's `fields`
+    selection, serializes and, when worthwhile, compresses the body.
+
+    Args:
+        payload: JSON-serializable response data.
+        etag (bool): Add a strong ETag and answer a matching If-None-Match with 304
+            (for GET routes serving static data).
+        cache_control (str, optional): Cache-Control header value.
+
+    Returns:
+        Response: An application/json response.
+    """
+    body = dumps(select_fields(payload, request.args.get(FIELDS_PARAM)))
+
+    encoding = None
+    if COMPRESSION_ENABLED and len(body) >= COMPRESS_MIN_BYTES:
+        encoding = choose_encoding(request.headers.get("Accept-Encoding"), ENCODINGS)
+
+    tag = None
+    if etag:
+        # Each encoding is a different representation, so it gets its own strong ETag
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        tag = f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+    if tag and etag_matches(request.headers.get("If-None-Match"), tag):
+        response = Response(status=304)
+    else:
+        if encoding:
+            body = compress(body, encoding)
+        response = Response(body, mimetype="application/json")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+    if tag:
+        response.headers["ETag"] = tag
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
@@ -2,39 +2,38 @@
 Resume utilities for text extraction and processing.
 Supports PDF and DOCX file formats.
 """
+import json
 import re
 import sys
 import subprocess
-from typing import Dict
+from typing import Dict, Union
 
-try:
-    import spacy
-except ImportError:
-    spacy = None
+from logs import get_logger
+from textnorm import NormalizedText, clean_text, normalize
 
+log = get_logger("resume")
+
+# spaCy, PyPDF2 and python-docx are imported on first use rather than at module import,
+# keeping cold starts fast for requests that never parse or analyze a resume.
 nlp_model = None
+_spacy_missing = False
 
 def get_nlp_model():
-    global nlp_model
-    if nlp_model is None and spacy is not None:
+    global nlp_model, _spacy_missing
+    if nlp_model is None and not _spacy_missing:
+        try:
+            import spacy
+        except ImportError:
+            _spacy_missing = True
+            return None
         try:
             nlp_model = spacy.load("en_core_web_sm")
         except OSError:
-            print("Downloading spaCy en_core_web_sm model...")
+            log.info("Downloading spaCy en_core_web_sm model")
             subprocess.check_call([sys.executable, "-m", "spacy", "download", "en_core_web_sm"])
             nlp_model = spacy.load("en_core_web_sm")
     return nlp_model
 
-try:
-    from PyPDF2 import PdfReader
-except ImportError:
-    PdfReader = None
-
-try:
-    from docx import Document
-except ImportError:
-    Document = None
-
 
 RESUME_ANALYSIS_PROMPT = """
 Analyze the resume and provide feedback in EXACTLY this JSON format:
@@ -59,6 +58,220 @@ Analyze the resume and provide feedback in EXACTLY this JSON format:
 }}
 """
 
+RESUME_DELTA_PROMPT = """
+The candidate edited a resume you already analyzed. Your previous analysis was:
+{previous}
+Only the sections below changed; everything else is as before. Revise the previous analysis
+for these changes and return the complete analysis in EXACTLY the same JSON format.
+{resume_text}
+"""
+
+
+# Rough characters-per-token ratio for English prose with Gemini's tokenizer
+CHARS_PER_TOKEN = 4
+
+# Default token budget for the whole resume analysis prompt
+DEFAULT_PROMPT_TOKEN_BUDGET = 900
+
+# Section headers recognised in the flattened resume text, in the order sections get budget
+SECTION_HEADERS = {
+    "experience": ["work experience", "professional experience", "experience", "employment history", "work history"],
+    "skills": ["technical skills", "skills", "core competencies"],
+    "projects": ["projects", "personal projects", "academic projects"],
+    "education": ["education", "academic background", "qualifications"],
+    "certifications": ["certifications", "certificates", "achievements", "awards"],
+    "summary": ["professional summary", "summary", "objective", "profile", "about me"]
+}
+
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.;])\s+|\s+-\s+')
+_QUANTIFIED_RE = re.compile(r'\d')
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token count estimate used for prompt budgeting."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+_SECTION_HEADER_RES = {
+    section: [re.compile(r'\b(?:%s|%s)\b' % (re.escape(name.upper()), re.escape(name.title()))) for name in names]
+    for section, names in SECTION_HEADERS.items()
+}
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """
+    Splits flattened resume text into sections by locating header words.
+    Headers are only recognised in UPPER or Title case, which keeps body text such as
+    "5 years of experience" from being mistaken for a heading.
+
+    Returns:
+        dict: section name -> text, with anything before the first header under "contact".
+    """
+    starts = []
+    for section, patterns in _SECTION_HEADER_RES.items():
+        for pattern in patterns:
+            match = pattern.search(text)
+            if match:
+                starts.append((match.start(), match.end(), section))
+                break
+
+    starts.sort()
+    sections = {}
+    first = starts[0][0] if starts else len(text)
+    if text[:first].strip():
+        sections["contact"] = text[:first].strip()
+    for i, (start, end, section) in enumerate(starts):
+        stop = starts[i + 1][0] if i + 1 < len(starts) else len(text)
+        body = text[end:stop].strip(" :-")
+        if body:
+            sections[section] = sections.get(section, "") + body
+    return sections
+
+
+_HEADER_LOOKUP = {name: section for section, names in SECTION_HEADERS.items() for name in names}
+
+
+def segment_resume(raw_text: str) -> Dict[str, str]:
+    """
+    Splits extracted resume text into sections while its line structure is still intact,
+    then cleans each section with preprocess_resume_text(). A heading is a line that
+    consists only of a known section name (any case, optionally followed by a colon).
+    Falls back to split_sections() on the flattened text when no heading lines are found,
+    e.g. for PDFs whose extractor joins lines.
+
+    Returns:
+        dict: section name -> cleaned text, with lines before the first heading under "contact".
+    """
+    lines_by_section = {}
+    current = "contact"
+    found_heading = False
+    for line in raw_text.splitlines():
+        key = line.strip().strip(":-|*# ").lower()
+        section = _HEADER_LOOKUP.get(key)
+        if section:
+            current, found_heading = section, True
+            continue
+        lines_by_section.setdefault(current, []).append(line)
+
+    if not found_heading:
+        clean_text = preprocess_resume_text(raw_text)
+        return split_sections(clean_text) or ({"resume": clean_text} if clean_text else {})
+
+    sections = {}
+    for name, lines in lines_by_section.items():
+        text = preprocess_resume_text("\n".join(lines))
+        if text:
+            sections[name] = text
+    return sections
+
+
+def summarize_section(text: str, max_tokens: int, keywords: Dict[str, list]) -> str:
+    """
+    Extractive summary of one section within `max_tokens`.
+    Sentences with numbers, known skills or action verbs are kept first; the
+    chosen sentences are emitted in their original order.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    signals = [k.lower() for k in keywords.get('technical_skills', []) + keywords.get('action_verbs', [])]
+    sentences = [s.strip() for s in _SENTENCE_SPLIT_RE.split(text) if s.strip()]
+
+    def score(sentence):
+        lower = sentence.lower()
+        return (2 if _QUANTIFIED_RE.search(sentence) else 0) + sum(1 for k in signals if k in lower)
+
+    ranked = sorted(range(len(sentences)), key=lambda i: (-score(sentences[i]), i))
+    chosen, used = [], 0
+    for i in ranked:
+        cost = estimate_tokens(sentences[i]) + 1
+        if used + cost > max_tokens:
+            continue
+        chosen.append(i)
+        used += cost
+    if not chosen:
+        # No single sentence fits (e.g. one long comma separated skills line): cut at a word boundary
+        return text[:max(0, max_tokens) * CHARS_PER_TOKEN].rsplit(" ", 1)[0]
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def build_resume_prompt(clean_text: str, keywords: Dict[str, list], nlp_analysis: Dict[str, any],
+                        ats_data: Dict[str, any], token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+                        sections: Dict[str, str] = None, previous_analysis: Dict[str, any] = None,
+                        removed_sections: list = None) -> str:
+    """
+    Builds a compact resume analysis prompt that fits within `token_budget`.
+
+    Instead of sending a raw prefix of the resume, the prompt carries the already
+    computed keyword / NLP / ATS features plus per-section extractive summaries, so
+    long resumes are covered end to end and boilerplate doesn't spend tokens.
+
+    Args:
+        clean_text: Preprocessed resume text.
+        keywords: Output of analyze_resume_keywords().
+        nlp_analysis: Output of extract_nlp_analysis().
+        ats_data: Output of calculate_ats_score().
+        token_budget: Approximate upper bound on prompt tokens.
+        sections: Pre-split sections; split_sections(clean_text) is used if None.
+        previous_analysis: The AI analysis of an earlier version of this resume. When given,
+            `sections` should hold only the changed sections and a delta prompt asking the
+            model to revise that analysis is built instead.
+        removed_sections: Section names present in the earlier version but not in this one.
+
+    Returns:
+        The prompt string.
+    """
+    breakdown = ", ".join(f"{name} {v['score']}/{v['max']}" for name, v in ats_data.get("breakdown", {}).items())
+    features = [
+        "Pre-computed resume features:",
+        f"ATS score: {ats_data.get('total', 0)}/100 ({breakdown})",
+        f"Experience level: {nlp_analysis.get('experience_level', 'Unknown')}",
+        f"Technical skills: {', '.join(keywords.get('technical_skills', [])) or 'None'}",
+        f"Soft skills: {', '.join(keywords.get('soft_skills', [])) or 'None'}",
+        f"Action verbs: {', '.join(keywords.get('action_verbs', [])) or 'None'}",
+        f"Organizations: {', '.join(keywords.get('organizations', [])) or 'None'}",
+        f"Education: {', '.join(nlp_analysis.get('education', [])) or 'None'}",
+        f"Domain keywords: {', '.join(nlp_analysis.get('domain_keywords', [])) or 'None'}",
+    ]
+    if previous_analysis is not None:
+        if removed_sections:
+            features.append(f"Removed sections: {', '.join(removed_sections)}")
+        features.append("Changed sections (condensed):")
+        template = RESUME_DELTA_PROMPT
+        previous = json.dumps(previous_analysis, separators=(",", ":"))
+    else:
+        features.append("Resume sections (condensed):")
+        template, previous = RESUME_ANALYSIS_PROMPT, ""
+    feature_block = "\n".join(features)
+
+    fixed_cost = estimate_tokens(template) + estimate_tokens(previous) + estimate_tokens(feature_block)
+    remaining = max(0, token_budget - fixed_cost)
+
+    if sections is None:
+        sections = split_sections(clean_text)
+    if not sections and previous_analysis is None:
+        sections = {"resume": clean_text}
+
+    # Water-fill the remaining budget: small sections (e.g. skills) fit whole, and the budget
+    # they don't need flows to the long ones (usually experience)
+    order = list(SECTION_HEADERS) + [name for name in sections if name not in SECTION_HEADERS]
+    present = [name for name in order if name in sections]
+    allowance = {}
+    by_size = sorted(present, key=lambda name: estimate_tokens(sections[name]))
+    for i, name in enumerate(by_size):
+        need = estimate_tokens(sections[name]) + 3  # +3 for the "[NAME] " label
+        allowance[name] = min(need, remaining // (len(by_size) - i))
+        remaining -= allowance[name]
+
+    lines = []
+    for name in present:
+        label = f"[{name.upper()}] "
+        summary = summarize_section(sections[name], allowance[name] - estimate_tokens(label), keywords)
+        if summary:
+            lines.append(label + summary)
+
+    return template.format(resume_text=feature_block + "\n" + "\n".join(lines), previous=previous)
+
 
 def extract_text_from_pdf(file_stream) -> str:
     """
@@ -70,7 +283,9 @@ def extract_text_from_pdf(file_stream) -> str:
     Returns:
         Extracted text as string
     """
-    if PdfReader is None:
+    try:
+        from PyPDF2 import PdfReader
+    except ImportError:
         raise ImportError("PyPDF2 is not installed. Install it with: pip install PyPDF2")
     
     try:
@@ -95,7 +310,9 @@ def extract_text_from_docx(file_stream) -> str:
     Returns:
         Extracted text as string
     """
-    if Document is None:
+    try:
+        from docx import Document
+    except ImportError:
         raise ImportError("python-docx is not installed. Install it with: pip install python-docx")
     
     try:
@@ -139,33 +356,65 @@ def preprocess_resume_text(text: str) -> str:
         text: Raw extracted text
         
     Returns:
-        Cleaned text
+        Cleaned text (see textnorm.clean_text)
     """
-    # Remove extra whitespace (multiple spaces to single space)
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove special characters but keep punctuation necessary for sentence structure
-    # Keeps: alphanumerics, spaces, ., ;, :, (), -, @, +, #
-    text = re.sub(r'[^\w\s.,;:()\-@+#]', '', text)
-    
-    return text.strip()
+    return clean_text(text)
 
 
-def analyze_resume_keywords(text: str) -> Dict[str, list]:
+def doc_features(doc) -> Dict[str, list]:
+    """
+    Collects everything the scorers read from a spaCy Doc in a single pass over its
+    tokens and entities. The result is memoized on the Doc, so the keyword and NLP
+    scorers share one pass.
+
+    Returns:
+        dict: verb lemmas, domain nouns, and ORG / GPE / DATE entity texts.
+    """
+    cached = doc.user_data.get("guidefy_features")
+    if cached is not None:
+        return cached
+
+    verbs, nouns = set(), []
+    for token in doc:
+        if token.pos_ == 'VERB':
+            verbs.add(token.lemma_.lower())
+        elif token.pos_ == 'NOUN' and len(token.text) > 3 and not token.is_stop:
+            nouns.append(token.text.lower())
+
+    entities = {'ORG': set(), 'GPE': set(), 'DATE': set()}
+    for ent in doc.ents:
+        if ent.label_ in entities:
+            entities[ent.label_].add(ent.text)
+
+    features = {
+        "verbs": verbs,
+        "nouns": nouns,
+        "organizations": list(entities['ORG']),
+        "locations": list(entities['GPE']),
+        "dates": list(entities['DATE'])
+    }
+    doc.user_data["guidefy_features"] = features
+    return features
+
+
+def analyze_resume_keywords(text: Union[str, NormalizedText], doc=None) -> Dict[str, list]:
     """
     Analyze resume for common keywords and categories using NLP.
     
     Args:
-        text: Resume text
+        text: Cleaned resume text, or its NormalizedText
+        doc: spaCy Doc for `text` if already parsed; parsed here when None and spaCy is available
         
     Returns:
         Dictionary with keyword categories and NLP entities
     """
-    text_lower = text.lower()
+    norm = normalize(text, clean=False)
+    text_lower = norm.lower
     nlp = get_nlp_model()
     
     # Process text with spaCy if available
-    doc = nlp(text) if nlp else None
+    if doc is None and nlp:
+        doc = nlp(norm.text)
     
     technical_skills = [
         'python', 'java', 'javascript', 'react', 'node', 'sql', 'aws', 'docker',
@@ -188,21 +437,16 @@ def analyze_resume_keywords(text: str) -> Dict[str, list]:
     
     if doc:
         # Use NLP for action verbs: match on lemmas
-        doc_lemmas = [token.lemma_.lower() for token in doc if token.pos_ == 'VERB']
-        found_action_verbs = list(set([verb for verb in action_verbs if verb in doc_lemmas]))
-        
-        # Extract entities
-        organizations = list(set([ent.text for ent in doc.ents if ent.label_ == 'ORG']))
-        locations = list(set([ent.text for ent in doc.ents if ent.label_ == 'GPE']))
-        dates = list(set([ent.text for ent in doc.ents if ent.label_ == 'DATE']))
+        features = doc_features(doc)
+        found_action_verbs = [verb for verb in action_verbs if verb in features["verbs"]]
         
         found_keywords = {
             'technical_skills': found_tech_skills,
             'soft_skills': found_soft_skills,
             'action_verbs': found_action_verbs,
-            'organizations': organizations[:10], # Limit to avoid bloat
-            'locations': locations[:10],
-            'dates': dates[:10]
+            'organizations': features["organizations"][:10], # Limit to avoid bloat
+            'locations': features["locations"][:10],
+            'dates': features["dates"][:10]
         }
     else:
         # Fallback to simple matching if spaCy is unavailable
@@ -219,12 +463,43 @@ def analyze_resume_keywords(text: str) -> Dict[str, list]:
     return found_keywords
 
 
-def calculate_ats_score(text: str, keywords: Dict[str, list]) -> Dict[str, any]:
+ATS_SECTION_NAMES = ['experience', 'education', 'skills', 'projects']
+ATS_EDUCATION_KEYWORDS = ['bachelor', 'master', 'phd', 'b.tech', 'm.tech', 'bsc', 'msc', 'diploma', 'certificate', 'certification', 'high school', 'degree', 'university', 'college']
+
+
+
+def ats_signals(text: Union[str, NormalizedText]) -> Dict[str, any]:
+    """
+    Extracts the text-level signals the ATS score is computed from. Signals of
+    separate resume sections can be combined with merge_section_features(), so the
+    score can be recomputed without re-reading unchanged sections.
+    """
+    norm = normalize(text, clean=False)
+    text_lower = norm.lower
+    return {
+        "email": bool(norm.emails),
+        "phone": bool(norm.phones),
+        "sections": [section for section in ATS_SECTION_NAMES if section in text_lower],
+        "impact_numbers": len(norm.impact_numbers),
+        "education": [edu for edu in ATS_EDUCATION_KEYWORDS if edu in text_lower]
+    }
+
+
+def calculate_ats_score(text: Union[str, NormalizedText], keywords: Dict[str, list], signals: Dict[str, any] = None) -> Dict[str, any]:
     """
     Calculate ATS (Applicant Tracking System) compatibility score.
+
+    Args:
+        text: Cleaned resume text or its NormalizedText (ignored when `signals` is given)
+        keywords: Output of analyze_resume_keywords()
+        signals: Pre-computed ats_signals(), e.g. merged from cached sections
+
     Returns:
         Dict with total_score between 0-100 and a breakdown of components
     """
+    if signals is None:
+        signals = ats_signals(text)
+
     breakdown = {
         "Skills Match Score": 0,
         "Keyword Match Score": 0,
@@ -236,16 +511,13 @@ def calculate_ats_score(text: str, keywords: Dict[str, list]) -> Dict[str, any]:
     # 1. Contact Info & Sections (Formatting Score max 20)
     fmt_score = 0
     # Check for contact information (email, phone)
-    if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):
+    if signals["email"]:
         fmt_score += 10
-    if re.search(r'\b\d{10}\b|\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b', text):
+    if signals["phone"]:
         fmt_score += 5
     
     # Check for section headers
-    common_sections = ['experience', 'education', 'skills', 'projects']
-    for section in common_sections:
-        if section in text.lower():
-            fmt_score += 1.25
+    fmt_score += 1.25 * len(signals["sections"])
     breakdown["Formatting Score"] = min(int(fmt_score), 20)
     
     # 2. Skills Match Score (max 25)
@@ -281,17 +553,16 @@ def calculate_ats_score(text: str, keywords: Dict[str, list]) -> Dict[str, any]:
     if date_count >= 3:
         exp_score += 10  # Specifying precise timelines is a strong ATS signal
     
-    numbers = re.findall(r'\b\d+%|\b\d+\+|\b\d+x\b', text)
-    if len(numbers) >= 3:
+    numbers = signals["impact_numbers"]
+    if numbers >= 3:
         exp_score += 10
-    elif len(numbers) >= 1:
+    elif numbers >= 1:
         exp_score += 5
     breakdown["Experience Score"] = min(exp_score, 20)
 
     # 5. Education Score (max 10)
     edu_score = 0
-    education_keywords = ['bachelor', 'master', 'phd', 'b.tech', 'm.tech', 'bsc', 'msc', 'diploma', 'certificate', 'certification', 'high school', 'degree', 'university', 'college']
-    edu_count = sum(1 for edu in education_keywords if edu in text.lower())
+    edu_count = len(signals["education"])
     if edu_count >= 2:
         edu_score = 10
     elif edu_count >= 1:
@@ -315,58 +586,152 @@ def calculate_ats_score(text: str, keywords: Dict[str, list]) -> Dict[str, any]:
     }
 
 
-def extract_nlp_analysis(text: str) -> Dict[str, any]:
+NLP_TECHNICAL_SKILLS = [
+    'python', 'java', 'javascript', 'react', 'node', 'sql', 'aws', 'docker',
+    'kubernetes', 'git', 'machine learning', 'ai', 'data science', 'tensorflow',
+    'pytorch', 'html', 'css', 'angular', 'vue', 'mongodb', 'postgresql', 'c++', 'c#',
+    'fastapi', 'flask', 'django', 'spring', 'go', 'rust', 'azure', 'gcp'
+]
+NLP_EDUCATION_KEYWORDS = ['bachelor', 'master', 'phd', 'b.tech', 'm.tech', 'bsc', 'msc', 'diploma', 'certificate', 'certification', 'high school', 'degree']
+
+def nlp_signals(text: Union[str, NormalizedText], doc=None) -> Dict[str, any]:
     """
-    Extracts NLP-driven insights: skills, experience level, education, keywords.
+    Extracts the per-text signals behind extract_nlp_analysis(): detected skills and
+    education, experience-level cues and domain noun counts.
     """
-    text_lower = text.lower()
+    norm = normalize(text, clean=False)
+    text_lower = norm.lower
     nlp = get_nlp_model()
-    
-    # Process text with spaCy if available
-    doc = nlp(text) if nlp else None
+    if doc is None and nlp:
+        doc = nlp(norm.text)
 
-    # Extracted skills (technical + tools)
-    technical_skills = [
-        'python', 'java', 'javascript', 'react', 'node', 'sql', 'aws', 'docker',
-        'kubernetes', 'git', 'machine learning', 'ai', 'data science', 'tensorflow',
-        'pytorch', 'html', 'css', 'angular', 'vue', 'mongodb', 'postgresql', 'c++', 'c#',
-        'fastapi', 'flask', 'django', 'spring', 'go', 'rust', 'azure', 'gcp'
-    ]
-    skills_detected = [skill for skill in technical_skills if skill in text_lower]
+    skills_detected = [skill for skill in NLP_TECHNICAL_SKILLS if skill in text_lower]
 
-    # Education
-    education_keywords = ['bachelor', 'master', 'phd', 'b.tech', 'm.tech', 'bsc', 'msc', 'diploma', 'certificate', 'certification', 'high school', 'degree']
-    education_detected = list(set([edu for edu in education_keywords if edu in text_lower]))
+    advanced = any(word in text_lower for word in ['senior', 'lead', 'manager', 'director', 'principal', 'head'])
+    intermediate = any(word in text_lower for word in ['intermediate', 'mid-level'])
+    beginner = any(word in text_lower for word in ['intern', 'junior', 'fresher', 'entry-level', 'beginner'])
+    # "N years" mentions: N selects the experience level they indicate
+    for years, plus in norm.experience_years:
+        if 10 <= years <= 20:
+            advanced = True
+        elif 3 <= years <= 9:
+            intermediate = True
+        elif years <= 2 and not plus:
+            beginner = True
 
-    # Experience level classification
-    if any(word in text_lower for word in ['senior', 'lead', 'manager', 'director', 'principal', 'head']) or re.search(r'\b(1[0-9]|20)\+?\s*years?\b', text_lower):
-        experience_level = "Advanced"
-    elif any(word in text_lower for word in ['intermediate', 'mid-level']) or re.search(r'\b[3-9]\+?\s*years?\b', text_lower):
-        experience_level = "Intermediate"
-    elif any(word in text_lower for word in ['intern', 'junior', 'fresher', 'entry-level', 'beginner']) or re.search(r'\b[0-2]\s*years?\b', text_lower):
-        experience_level = "Beginner"
-    else:
-        experience_level = "Intermediate" if len(skills_detected) > 5 else "Beginner"
+    # Experience level cues, most senior first
+    levels = [level for level, found in (("Advanced", advanced), ("Intermediate", intermediate), ("Beginner", beginner)) if found]
 
     # Important keywords (Domain related nouns)
-    important_keywords = []
     if doc:
         from collections import Counter
-        # Extract Nouns and Proper Nouns, ignoring short words and stop words
-        nouns = [token.text.lower() for token in doc if token.pos_ in ['NOUN'] and len(token.text) > 3 and not token.is_stop]
-        
-        # Don't include words that are already in skills or education
-        filtered_nouns = [n for n in nouns if n not in technical_skills and n not in education_keywords]
-        
-        top_nouns = [word for word, count in Counter(filtered_nouns).most_common(8)]
-        important_keywords = top_nouns
+        # Nouns from the shared Doc pass; don't include words that are already in skills or education
+        nouns = doc_features(doc)["nouns"]
+        noun_counts = dict(Counter(n for n in nouns if n not in NLP_TECHNICAL_SKILLS and n not in NLP_EDUCATION_KEYWORDS))
     else:
         # Fallback if no spaCy
-        important_keywords = list(set([word for word in text_lower.split() if len(word) > 5]))[:8]
+        noun_counts = {word: 1 for word in set(norm.lower.split()) if len(word) > 5}
 
     return {
         "skills": skills_detected,
+        "education": list(set([edu for edu in NLP_EDUCATION_KEYWORDS if edu in text_lower])),
+        "levels": levels,
+        "noun_counts": noun_counts
+    }
+
+
+def extract_nlp_analysis(text: Union[str, NormalizedText], doc=None, signals: Dict[str, any] = None) -> Dict[str, any]:
+    """
+    Extracts NLP-driven insights: skills, experience level, education, keywords.
+
+    Args:
+        text: Cleaned resume text or its NormalizedText (ignored when `signals` is given)
+        doc: spaCy Doc for `text` if already parsed
+        signals: Pre-computed nlp_signals(), e.g. merged from cached sections
+    """
+    if signals is None:
+        signals = nlp_signals(text, doc)
+
+    # Experience level classification
+    for level in ("Advanced", "Intermediate", "Beginner"):
+        if level in signals["levels"]:
+            experience_level = level
+            break
+    else:
+        experience_level = "Intermediate" if len(signals["skills"]) > 5 else "Beginner"
+
+    noun_counts = signals["noun_counts"]
+    top_nouns = sorted(noun_counts, key=lambda word: -noun_counts[word])[:8]
+
+    return {
+        "skills": signals["skills"],
         "experience_level": experience_level,
-        "education": education_detected,
-        "domain_keywords": important_keywords
+        "education": signals["education"],
+        "domain_keywords": top_nouns
     }
+
+
+def analyze_section(name: str, text: str, doc=None) -> Dict[str, any]:
+    """
+    Computes the cacheable features of one resume section: its keywords, ATS signals
+    and NLP signals. The result is plain JSON data keyed only by the section content.
+
+    Args:
+        name: Section name from segment_resume() (a recognised heading counts toward the ATS sections)
+        text: Cleaned section text
+        doc: spaCy Doc for `text` if already parsed (e.g. from nlp.pipe over several sections)
+    """
+    norm = normalize(text, clean=False)
+    nlp = get_nlp_model()
+    if doc is None and nlp:
+        doc = nlp(norm.text)
+
+    signals = ats_signals(norm)
+    if name in ATS_SECTION_NAMES and name not in signals["sections"]:
+        signals["sections"].append(name)
+
+    return {
+        "keywords": analyze_resume_keywords(norm, doc),
+        "ats": signals,
+        "nlp": nlp_signals(norm, doc)
+    }
+
+
+def _union(lists, limit: int = None) -> list:
+    merged = list(dict.fromkeys(item for items in lists for item in items))
+    return merged[:limit] if limit else merged
+
+
+def merge_section_features(features: list) -> tuple:
+    """
+    Combines analyze_section() results into whole-resume results.
+
+    Returns:
+        tuple: (keywords, ats_data, nlp_analysis) in the same shapes as
+               analyze_resume_keywords(), calculate_ats_score() and extract_nlp_analysis().
+    """
+    keywords = {
+        category: _union([f["keywords"].get(category, []) for f in features], 10 if category in ('organizations', 'locations', 'dates') else None)
+        for category in ('technical_skills', 'soft_skills', 'action_verbs', 'organizations', 'locations', 'dates')
+    }
+
+    ats = {
+        "email": any(f["ats"]["email"] for f in features),
+        "phone": any(f["ats"]["phone"] for f in features),
+        "sections": _union(f["ats"]["sections"] for f in features),
+        "impact_numbers": sum(f["ats"]["impact_numbers"] for f in features),
+        "education": _union(f["ats"]["education"] for f in features)
+    }
+
+    noun_counts = {}
+    for f in features:
+        for word, count in f["nlp"]["noun_counts"].items():
+            noun_counts[word] = noun_counts.get(word, 0) + count
+    nlp = {
+        "skills": [skill for skill in NLP_TECHNICAL_SKILLS if any(skill in f["nlp"]["skills"] for f in features)],
+        "education": _union(f["nlp"]["education"] for f in features),
+        "levels": _union(f["nlp"]["levels"] for f in features),
+        "noun_counts": noun_counts
+    }
+
+    return keywords, calculate_ats_score("", keywords, ats), extract_nlp_analysis("", signals=nlp)
@@ -0,0 +1,172 @@
+"""
+Per-section caching for incremental resume re-analysis.
+segment_resume() splits an upload into sections and each one is keyed by a
+content hash. Keyword, ATS and NLP features are cached per section, so a
+re-upload only runs spaCy over the sections that changed and the ATS score is
+recomputed from the merged section features. The AI analysis is cached per
+resume version (the set of section hashes): an identical re-upload reuses it
+outright, and when the same client session re-uploads an edited version, only
+the changed sections are sent to Gemini together with the previous analysis.
+
+Configuration (environment):
+    SECTION_CACHE_ENABLED   1 (default) / 0
+    SECTION_CACHE_SIZE      Cached sections, and cached analyses, per process (default 10000)
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from resume_utils import analyze_section, get_nlp_model
+
+# Earlier resume versions remembered per client session as delta bases
+VERSIONS_PER_CLIENT = 5
+
+
+def section_hash(name: str, text: str) -> str:
+    """Content hash of one section (the name is included since it affects the features)."""
+    return hashlib.blake2b(f"{name}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def version_key(hashes: Dict[str, str]) -> str:
+    """Hash identifying one resume version by its section hashes."""
+    joined = "\0".join(f"{name}={h}" for name, h in sorted(hashes.items()))
+    return hashlib.blake2b(joined.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SectionCache:
+    """
+    Bounded, thread-safe LRU caches of section features and per-version AI analyses.
+
+    Args:
+        capacity (int): Maximum entries in each cache; least recently used are evicted.
+        enabled (bool): When False every section is analyzed and nothing is stored.
+    """
+
+    def __init__(self, capacity: int = 10_000, enabled: bool = True):
+        self.capacity = max(1, capacity)
+        self.enabled = enabled
+        self._features: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._analyses: "OrderedDict[str, Tuple[Dict[str, str], Dict[str, Any]]]" = OrderedDict()
+        self._versions: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.section_hits = 0
+        self.section_misses = 0
+        self.analysis_hits = 0
+        self.delta_prompts = 0
+
+    @classmethod
+    def from_env(cls) -> "SectionCache":
+        return cls(
+            capacity=int(os.getenv("SECTION_CACHE_SIZE", "10000")),
+            enabled=os.getenv("SECTION_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+        )
+
+    def analyze(self, sections: Dict[str, str]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """
+        Returns the features of every section, analyzing only those not cached.
+        Uncached sections go through spaCy together with nlp.pipe().
+
+        Returns:
+            tuple: (section name -> analyze_section() result, section name -> content hash)
+        """
+        hashes = {name: section_hash(name, text) for name, text in sections.items()}
+        features = {}
+        if self.enabled:
+            with self._lock:
+                for name, h in hashes.items():
+                    cached = self._features.get(h)
+                    if cached is not None:
+                        self._features.move_to_end(h)
+                        features[name] = cached
+                self.section_hits += len(features)
+                self.section_misses += len(sections) - len(features)
+
+        missing = [name for name in sections if name not in features]
+        if missing:
+            nlp = get_nlp_model()
+            texts = [sections[name] for name in missing]
+            docs = nlp.pipe(texts) if nlp else [None] * len(texts)
+            for name, text, doc in zip(missing, texts, docs):
+                features[name] = analyze_section(name, text, doc)
+
+            if self.enabled:
+                with self._lock:
+                    for name in missing:
+                        self._features[hashes[name]] = features[name]
+                    while len(self._features) > self.capacity:
+                        self._features.popitem(last=False)
+
+        return {name: features[name] for name in sections}, hashes
+
+    def previous_analysis(self, client: Optional[str], hashes: Dict[str, str]) -> Tuple[Optional[Dict[str, Any]], List[str], List[str]]:
+        """
+        Finds a reusable AI analysis for this resume version.
+
+        Returns:
+            tuple: (analysis, changed section names, removed section names).
+                   An identical version returns its analysis with no changes. Otherwise the
+                   client's most similar earlier version is returned if at least half of the
+                   current sections are unchanged, or (None, all sections, []) if there is none.
+                   Without a `client` (no session) only the identical-version reuse applies.
+        """
+        if not self.enabled:
+            return None, list(hashes), []
+
+        with self._lock:
+            exact = self._analyses.get(version_key(hashes))
+            if exact is not None:
+                self._analyses.move_to_end(version_key(hashes))
+                self.analysis_hits += 1
+                return exact[1], [], []
+
+            best, best_shared = None, 0
+            for key in self._versions.get(client, []) if client else []:
+                entry = self._analyses.get(key)
+                if entry is None:
+                    continue
+                shared = sum(1 for name, h in hashes.items() if entry[0].get(name) == h)
+                if shared > best_shared:
+                    best, best_shared = entry, shared
+
+            if best is None or best_shared * 2 < len(hashes):
+                return None, list(hashes), []
+
+            self.delta_prompts += 1
+            base_hashes, analysis = best
+            changed = [name for name, h in hashes.items() if base_hashes.get(name) != h]
+            removed = [name for name in base_hashes if name not in hashes]
+            return analysis, changed, removed
+
+    def store_analysis(self, client: Optional[str], hashes: Dict[str, str], analysis: Dict[str, Any]) -> None:
+        """Remembers the AI analysis of a resume version, and the version as a delta base for `client` if given."""
+        if not self.enabled or not hashes:
+            return
+
+        key = version_key(hashes)
+        with self._lock:
+            self._analyses[key] = (dict(hashes), analysis)
+            self._analyses.move_to_end(key)
+            while len(self._analyses) > self.capacity:
+                self._analyses.popitem(last=False)
+
+            if not client:
+                return
+            versions = [k for k in self._versions.pop(client, []) if k != key]
+            self._versions[client] = [key] + versions[:VERSIONS_PER_CLIENT - 1]
+            while len(self._versions) > self.capacity:
+                self._versions.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "sections": len(self._features),
+                "analyses": len(self._analyses),
+                "section_hits": self.section_hits,
+                "section_misses": self.section_misses,
+                "analysis_hits": self.analysis_hits,
+                "delta_prompts": self.delta_prompts
+            }
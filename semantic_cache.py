@@ -0,0 +1,223 @@
+"""
+Semantic similarity cache for /career recommendations.
+Free-text inputs that mean the same thing rarely match exactly, so instead of
+keying on the raw text the cache vectorizes the lemmatized verbs, nouns and
+adjectives that career() extracts with spaCy and serves a prior recommendation
+when the cosine similarity to a cached input is above a threshold.
+
+The index is sparse and CPU-only: an inverted index per career field with
+prefix filtering, so a lookup only scores entries that share one of the
+query's rarer terms. It stays in the sub-millisecond range at 100k entries.
+"""
+
+import copy
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Relative importance of each feature group in the vector
+NOUN_WEIGHT = 1.0
+VERB_WEIGHT = 0.7
+ADJ_WEIGHT = 0.5
+GOAL_WEIGHT = 0.8
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9+#.]*")
+STOPWORDS = frozenset("""
+a an and are as at be by for from i in into is it me my of on or so the their to want was
+with would like love also very really about become work working job career good
+""".split())
+
+
+def tokenize(text: str) -> Iterable[str]:
+    """Lowercase word tokens with stopwords removed (used when spaCy is unavailable)."""
+    return [w.rstrip(".") for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS]
+
+
+def build_feature_vector(verbs: Iterable[str], nouns: Iterable[str], adjectives: Iterable[str], goal: str = "") -> Dict[str, float]:
+    """
+    Builds an L2-normalized sparse vector from the extracted lemmas.
+
+    Args:
+        verbs, nouns, adjectives: Lemmas extracted from the user's interests, strengths and subjects.
+        goal (str): The free-text career goal, tokenized with a simple word split.
+
+    Returns:
+        dict: term -> weight, with unit length (empty if there were no terms).
+    """
+    vec: Dict[str, float] = {}
+    for terms, weight in ((nouns, NOUN_WEIGHT), (verbs, VERB_WEIGHT), (adjectives, ADJ_WEIGHT), (tokenize(goal), GOAL_WEIGHT)):
+        for term in terms:
+            term = term.strip().lower()
+            if term and term not in STOPWORDS:
+                vec[term] = vec.get(term, 0.0) + weight
+
+    norm = math.sqrt(sum(w * w for w in vec.values()))
+    if norm == 0:
+        return {}
+    return {t: w / norm for t, w in vec.items()}
+
+
+class _Partition:
+    """Inverted index over the cached vectors of a single career field."""
+
+    __slots__ = ("postings", "vectors")
+
+    def __init__(self):
+        self.postings: Dict[str, set] = {}
+        self.vectors: Dict[int, Dict[str, float]] = {}
+
+    def add(self, entry_id: int, vec: Dict[str, float]) -> None:
+        self.vectors[entry_id] = vec
+        for term in vec:
+            self.postings.setdefault(term, set()).add(entry_id)
+
+    def remove(self, entry_id: int) -> None:
+        vec = self.vectors.pop(entry_id, None) or {}
+        for term in vec:
+            ids = self.postings.get(term)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del self.postings[term]
+
+    def nearest(self, query: Dict[str, float], threshold: float) -> Tuple[Optional[int], float]:
+        """
+        Returns the best (entry_id, similarity) with similarity >= threshold, or (None, 0.0).
+
+        Prefix filtering: with unit vectors, an entry sharing only terms from a suffix S of
+        the query has similarity <= ||q_S||. Terms are visited rarest first and candidates
+        are only generated until the remaining suffix norm drops below the threshold.
+        """
+        postings = self.postings
+        terms = sorted(query, key=lambda t: len(postings.get(t, ())))
+        remaining = sum(w * w for w in query.values())
+        threshold_sq = threshold * threshold
+
+        candidates = set()
+        for term in terms:
+            if remaining < threshold_sq:
+                break
+            ids = postings.get(term)
+            if ids:
+                candidates.update(ids)
+            remaining -= query[term] * query[term]
+
+        best_id, best_sim = None, 0.0
+        for entry_id in candidates:
+            vec = self.vectors[entry_id]
+            sim = sum(w * vec.get(t, 0.0) for t, w in query.items())
+            if sim > best_sim:
+                best_id, best_sim = entry_id, sim
+
+        if best_id is None or best_sim < threshold:
+            return None, 0.0
+        return best_id, best_sim
+
+
+class SemanticCache:
+    """
+    Bounded, thread-safe nearest-neighbour cache of normalized recommendations.
+
+    Args:
+        capacity (int): Maximum number of cached entries; least recently used are evicted.
+        threshold (float): Default cosine similarity required for a hit.
+        field_thresholds (dict, optional): Per-field overrides. A threshold above 1.0 disables
+            the cache for that field so every request in it goes to the LLM.
+        enabled (bool): When False, lookups always miss and nothing is stored.
+    """
+
+    def __init__(self, capacity: int = 100_000, threshold: float = 0.85,
+                 field_thresholds: Optional[Dict[str, float]] = None, enabled: bool = True):
+        self.capacity = max(1, capacity)
+        self.threshold = threshold
+        self.field_thresholds = dict(field_thresholds or {})
+        self.enabled = enabled
+        self._partitions: Dict[str, _Partition] = {}
+        self._entries: "OrderedDict[int, Tuple[str, Any]]" = OrderedDict()
+        self._signatures: Dict[Tuple, int] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "SemanticCache":
+        """
+        Builds a cache from SEMANTIC_CACHE_ENABLED, SEMANTIC_CACHE_SIZE, SEMANTIC_CACHE_THRESHOLD
+        and SEMANTIC_CACHE_FIELD_THRESHOLDS (e.g. "generic=1.1,medical=0.92").
+        """
+        field_thresholds = {"generic": 1.1}
+        for item in os.getenv("SEMANTIC_CACHE_FIELD_THRESHOLDS", "").split(","):
+            field, _, value = item.partition("=")
+            try:
+                field_thresholds[field.strip()] = float(value)
+            except ValueError:
+                continue
+        return cls(
+            capacity=int(os.getenv("SEMANTIC_CACHE_SIZE", "100000")),
+            threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85")),
+            field_thresholds=field_thresholds,
+            enabled=os.getenv("SEMANTIC_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+        )
+
+    def threshold_for(self, field: str) -> float:
+        return self.field_thresholds.get(field, self.threshold)
+
+    def lookup(self, field: str, vec: Dict[str, float]) -> Optional[Any]:
+        """
+        Returns a copy of the cached payload of the most similar input in `field`, or None on
+        a miss (including fields whose threshold routes them straight to the LLM). Callers may
+        modify the copy; the stored entry is never handed out.
+        """
+        threshold = self.threshold_for(field)
+        if not self.enabled or not vec or threshold > 1.0:
+            return None
+
+        with self._lock:
+            partition = self._partitions.get(field)
+            entry_id = partition.nearest(vec, threshold)[0] if partition else None
+            if entry_id is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entry_id)
+            self.hits += 1
+            payload = self._entries[entry_id][1]
+        return copy.deepcopy(payload)
+
+    def add(self, field: str, vec: Dict[str, float], payload: Any) -> None:
+        """Stores a copy of a payload for `vec`, replacing an identical input and evicting LRU entries."""
+        if not self.enabled or not vec or self.threshold_for(field) > 1.0:
+            return
+        payload = copy.deepcopy(payload)
+
+        signature = (field,) + tuple(sorted(vec))
+        with self._lock:
+            existing = self._signatures.get(signature)
+            if existing is not None:
+                self._entries[existing] = (field, payload)
+                self._entries.move_to_end(existing)
+                return
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self._partitions.setdefault(field, _Partition()).add(entry_id, vec)
+            self._entries[entry_id] = (field, payload)
+            self._signatures[signature] = entry_id
+
+            while len(self._entries) > self.capacity:
+                old_id, (old_field, _) = self._entries.popitem(last=False)
+                old_vec = self._partitions[old_field].vectors.get(old_id, {})
+                self._signatures.pop((old_field,) + tuple(sorted(old_vec)), None)
+                self._partitions[old_field].remove(old_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
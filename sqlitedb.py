@@ -0,0 +1,39 @@
+"""
+Shared SQLite connection handling for the stores that several worker processes
+write to (history.py, ratelimit.py). Each thread of each process gets its own
+WAL-mode connection, opened on first use: connections must not cross a fork,
+and the gunicorn master, which imports the app before forking, never needs one.
+"""
+
+import os
+import sqlite3
+import threading
+
+
+class LocalConnection:
+    """
+    Per-thread, per-process connection to one database file.
+
+    Args:
+        path (str): SQLite database file.
+        schema (str): Script run on every new connection (CREATE ... IF NOT EXISTS statements).
+        timeout (float): Seconds to wait for a lock held by another connection.
+    """
+
+    def __init__(self, path: str, schema: str = "", timeout: float = 5):
+        self.path = path
+        self.schema = schema
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def get(self) -> sqlite3.Connection:
+        """Returns this thread's connection, opening it if needed (or if the process has forked)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if self.schema:
+                conn.executescript(self.schema)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
@@ -12,6 +12,46 @@ function cleanText(text) {
   if (!text || text === "undefined") return "Not available";
   return text.replace(/\s+/g, " ").trim();
 }
+/**
+ * Returns this browser's session id for the analysis history, creating it on first use
+ */
+function getSessionId() {
+  let id = localStorage.getItem("guidefy-session");
+  if (!id) {
+    id = window.crypto && crypto.randomUUID ? crypto.randomUUID() : Date.now().toString(36) + Math.random().toString(36).slice(2);
+    localStorage.setItem("guidefy-session", id);
+  }
+  return id;
+}
+/**
+ * Fills in upskill.platforms when the response skipped them (fields=-recommendation.upskill.platforms).
+ * Platforms are static per field, so they are cached in localStorage and only fetched from
+ * /upskill/<field> when missing or when the response's platforms_etag no longer matches.
+ */
+const PLATFORMS_CACHE_KEY = "guidefy-upskill-platforms";
+async function attachPlatforms(u) {
+  if (!u || u.platforms || !u.field) return;
+  let cache = {};
+  try {
+    cache = JSON.parse(localStorage.getItem(PLATFORMS_CACHE_KEY)) || {};
+  } catch (e) {
+    cache = {};
+  }
+  const cached = cache[u.field];
+  if (cached && cached.etag === u.platforms_etag) {
+    u.platforms = cached.platforms;
+    return;
+  }
+  try {
+    const res = await fetch(`/upskill/${encodeURIComponent(u.field)}?fields=platforms,platforms_etag`);
+    const block = await res.json();
+    u.platforms = block.platforms || [];
+    cache[u.field] = { etag: block.platforms_etag, platforms: u.platforms };
+    localStorage.setItem(PLATFORMS_CACHE_KEY, JSON.stringify(cache));
+  } catch (e) {
+    u.platforms = [];
+  }
+}
 // AI STATUS INDICATOR
 /**
  * Helper to render styled status
@@ -419,13 +459,14 @@ form.addEventListener("submit", async (e) => {
   };
 
   try {
-    const res = await fetch("/career", {
+    const res = await fetch("/career?fields=-recommendation.upskill.platforms", {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
+      headers: { "Content-Type": "application/json", "X-Session-Id": getSessionId() },
       body: JSON.stringify(payload)
     });
 
     const json = await res.json();
+    if (json.recommendation) await attachPlatforms(json.recommendation.upskill);
 
     // Complete the bar before showing results
     clearInterval(progressInterval);
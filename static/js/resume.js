@@ -13,6 +13,16 @@ const analyzeAnotherBtn = document.getElementById('analyze-another');
 
 let selectedFile = null;
 
+// Session id for the analysis history, created on first use
+function getSessionId() {
+  let id = localStorage.getItem('guidefy-session');
+  if (!id) {
+    id = window.crypto && crypto.randomUUID ? crypto.randomUUID() : Date.now().toString(36) + Math.random().toString(36).slice(2);
+    localStorage.setItem('guidefy-session', id);
+  }
+  return id;
+}
+
 // Drag and drop handlers
 dropZone.addEventListener('dragover', (e) => {
   e.preventDefault();
@@ -91,6 +101,7 @@ analyzeBtn.addEventListener('click', async () => {
 
     const response = await fetch('/resume-analyze', {
       method: 'POST',
+      headers: { 'X-Session-Id': getSessionId() },
       body: formData
     });
 
@@ -0,0 +1,99 @@
+"""
+Single-pass text normalization shared by the resume scorers.
+normalize() cleans the extracted text once and derives everything the keyword,
+ATS and NLP scorers need from it: the lowercase form, word token offsets and
+the regex features (emails, phone numbers, quantified impact numbers, year
+spans and "N years" mentions). All patterns are precompiled, and the numeric
+features come from one combined scan, so a scorer never re-lowers or re-scans
+the text itself.
+"""
+
+import re
+from typing import List, Tuple, Union
+
+# Characters kept by the cleaner besides word characters and whitespace
+_DISALLOWED_RE = re.compile(r'[^\w\s.,;:()\-@+#]+')
+
+_TOKEN_RE = re.compile(r'\w[\w+#]*')
+
+_EMAIL_RE = re.compile(r'\b[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z|]{2,}\b')
+
+# Numeric features in one scan over the cleaned text. Each alternative continues after the
+# first digit of a number, so the pattern starts with a character class (which the regex engine
+# skips ahead to quickly) and the lookbehind stands in for a leading \b.
+_NUMBER_RE = re.compile(r"""
+    [0-9](?<!\w[0-9])
+    (?:
+        (?P<span>\d{3}(?<=19\d\d|20\d\d)\s*(?i:-|to|until)?\s*(?:[A-Za-z]{3,9}\.?\s+)?(?:(?:19|20)\d{2}|(?i:present|current|now))\b)
+      | (?P<phone>\d{9}\b|\d{2}[-.\s]?\d{3}[-.\s]?\d{4}\b)
+      | (?P<impact>\d*(?:%|\+|x\b))
+    )
+""", re.VERBOSE)
+
+# "N years" / "N+ years" mentions (may overlap an impact number such as "5+", hence a separate scan)
+_YEARS_RE = re.compile(r'([0-9])(?<!\w[0-9])(\d?)(\+?)\s*years?\b')
+
+
+def clean_text(text: str) -> str:
+    """
+    Collapses whitespace and drops special characters, keeping punctuation
+    needed for sentence structure (., ;, :, (), -, @, +, #).
+    """
+    return _DISALLOWED_RE.sub('', ' '.join(text.split())).strip()
+
+
+class NormalizedText:
+    """
+    Cleaned text plus the features derived from it.
+
+    Attributes:
+        text (str): Cleaned text.
+        lower (str): text.lower().
+        emails, phones, impact_numbers, year_spans (list): Matched substrings of `text`.
+        experience_years (list): (years, has_plus) for each "N years" / "N+ years" mention.
+        tokens (list): (start, end) offsets of word tokens in `text`, computed on first use.
+        words (list): The lowercase word tokens, computed on first use.
+    """
+
+    __slots__ = ("text", "lower", "emails", "phones", "impact_numbers", "year_spans", "experience_years",
+                 "_tokens", "_words")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = lower = text.lower()
+        self._tokens = None
+        self._words = None
+
+        self.emails = [text[m.start():m.end()] for m in _EMAIL_RE.finditer(lower)] if "@" in lower else []
+        self.phones, self.impact_numbers, self.year_spans = [], [], []
+        buckets = {"phone": self.phones, "impact": self.impact_numbers, "span": self.year_spans}
+        for match in _NUMBER_RE.finditer(text):
+            buckets[match.lastgroup].append(match.group())
+
+        self.experience_years = [(int(first + rest), plus == "+") for first, rest, plus in _YEARS_RE.findall(lower)]
+
+    @property
+    def tokens(self) -> List[Tuple[int, int]]:
+        if self._tokens is None:
+            self._tokens = [m.span() for m in _TOKEN_RE.finditer(self.lower)]
+        return self._tokens
+
+    @property
+    def words(self) -> List[str]:
+        if self._words is None:
+            self._words = _TOKEN_RE.findall(self.lower)
+        return self._words
+
+
+def normalize(text: Union[str, NormalizedText], clean: bool = True) -> NormalizedText:
+    """
+    Returns the normalized form of `text`. Already normalized input is returned as is,
+    so scorers can accept either a string or a shared NormalizedText.
+
+    Args:
+        text: Raw text, or a NormalizedText.
+        clean (bool): Set to False when `text` has already been through clean_text().
+    """
+    if isinstance(text, NormalizedText):
+        return text
+    return NormalizedText(clean_text(text) if clean else text)
@@ -1,9 +1,13 @@
 import os
 import json
-import requests
 import re
 from typing import List, Dict, Any, Optional
 
+from logs import error_fields, get_logger
+from responses import block_etag
+
+log = get_logger("utils")
+
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
 def fetch_youtube_videos(query: str, max_results: int = 3) -> List[Dict[str, str]]:
@@ -32,6 +36,8 @@ def fetch_youtube_videos(query: str, max_results: int = 3) -> List[Dict[str, str
     }
 
     try:
+        # Imported here so modules that never hit YouTube (e.g. static page serving) don't load requests
+        import requests
         res = requests.get(url, params=params, timeout=5)
         data = res.json()
 
@@ -54,7 +60,7 @@ def fetch_youtube_videos(query: str, max_results: int = 3) -> List[Dict[str, str
         return videos
 
     except Exception as e:
-        print("❌ YouTube API Error:", e)
+        log.warning("YouTube API request failed", extra={"event": "youtube_error", **error_fields(e)})
         return []
 
 def extract_json(text: str) -> Dict[str, Any]:
@@ -87,25 +93,40 @@ def extract_json(text: str) -> Dict[str, Any]:
 
     return json.loads(text[start:end])
 
+# Career field taxonomy, checked in order; the first field with a matching keyword wins
+FIELD_KEYWORDS = {
+    "ai_ml": ["artificial intelligence", "ai", "machine learning", "ml", "deep learning", "neural network"],
+    "technology": ["information technology", "computer science", "software", "programming", "developer", "coding", "data science"],
+    "cyber": ["cyber security", "network security", "hacking"],
+    "medical": ["medical", "medicine", "healthcare", "doctor", "nurse", "mbbs", "pharmacy", "hospital"],
+    "politics": ["politics", "political science", "public policy", "governance", "civil services", "upsc", "law"],
+    "business": ["business", "management", "commerce", "mba", "entrepreneur"],
+    "agriculture": ["agriculture", "farming", "crop", "soil", "agribusiness"]
+}
+
+_field_patterns = None
+
+def get_field_patterns() -> List[Any]:
+    """
+    Returns (field, compiled pattern) pairs for FIELD_KEYWORDS, compiling them once per process.
+    Each field's keywords are folded into a single word-bounded alternation.
+    """
+    global _field_patterns
+    if _field_patterns is None:
+        _field_patterns = [
+            (field, re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b"))
+            for field, keywords in FIELD_KEYWORDS.items()
+        ]
+    return _field_patterns
+
 def detect_field(text: str) -> str:
     """
     Detects the career field based on keywords in the provided text.
     """
     t = text.lower()
 
-    # Field mapping for easier maintenance
-    field_keywords = {
-        "ai_ml": ["artificial intelligence", "ai", "machine learning", "ml", "deep learning", "neural network"],
-        "technology": ["information technology", "computer science", "software", "programming", "developer", "coding", "data science"],
-        "cyber": ["cyber security", "network security", "hacking"],
-        "medical": ["medical", "medicine", "healthcare", "doctor", "nurse", "mbbs", "pharmacy", "hospital"],
-        "politics": ["politics", "political science", "public policy", "governance", "civil services", "upsc", "law"],
-        "business": ["business", "management", "commerce", "mba", "entrepreneur"],
-        "agriculture": ["agriculture", "farming", "crop", "soil", "agribusiness"]
-    }
-
-    for field, keywords in field_keywords.items():
-        if any(re.search(rf"\b{re.escape(k)}\b", t) for k in keywords):
+    for field, pattern in get_field_patterns():
+        if pattern.search(t):
             return field
 
     return "generic"
@@ -124,10 +145,10 @@ def load_upskill_db() -> Dict[str, Any]:
         with open(file_path, "r") as f:
             return json.load(f)
     except Exception as e:
-        print(f"❌ Error loading UPSKILL_DB: {e}")
+        log.error("Failed to load upskill database", extra=error_fields(e))
         return {}
 
-def build_upskill(user_text: str, db: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def build_upskill(user_text: str, db: Optional[Dict[str, Any]] = None, fetch_videos: bool = True) -> Dict[str, Any]:
     """
     Builds the upskill section of the response by selecting the appropriate field
     from the database and optionally fetching YouTube videos.
@@ -135,15 +156,20 @@ def build_upskill(user_text: str, db: Optional[Dict[str, Any]] = None) -> Dict[s
     Args:
         user_text (str): The user's input text (interests + career goal).
         db (dict, optional): The upskill database. Loads from disk if None.
+        fetch_videos (bool): Query YouTube for fresh videos. When False (e.g. degraded
+            responses under load) only the curated videos from the database are used.
 
     Returns:
-        dict: A dictionary containing upskilling resources (roadmap, videos, etc).
+        dict: A dictionary containing upskilling resources (roadmap, videos, etc), plus the
+              detected "field" and a "platforms_etag" identifying its static platforms block.
     """
     if db is None:
         db = load_upskill_db()
         
     field = detect_field(user_text)
     base = db.get(field, db.get("generic", {})).copy()
+    base["field"] = field if field in db else "generic"
+    base["platforms_etag"] = block_etag(base.get("platforms", []))
 
     # YouTube search queries
     query_map = {
@@ -160,7 +186,7 @@ def build_upskill(user_text: str, db: Optional[Dict[str, Any]] = None) -> Dict[s
     yt_query = query_map.get(field, "career guidance for students")
 
     # Fetch LIMITED YouTube videos
-    yt_videos = fetch_youtube_videos(yt_query, max_results=3)
+    yt_videos = fetch_youtube_videos(yt_query, max_results=3) if fetch_videos else []
 
     # Use YouTube ONLY if valid videos exist
     if yt_videos:
@@ -171,13 +197,16 @@ def build_upskill(user_text: str, db: Optional[Dict[str, Any]] = None) -> Dict[s
 
     return base
 
-def normalize_output(raw: Dict[str, Any], user_text: str, db: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def normalize_output(raw: Dict[str, Any], user_text: str, db: Optional[Dict[str, Any]] = None, fetch_videos: bool = True) -> Dict[str, Any]:
     """
     Ensures consistent API response format.
+    `fetch_videos` is passed through to build_upskill().
     """
     confidence_score = raw.get("confidence_score", {})
     if not isinstance(confidence_score, dict):
         confidence_score = {"explanation": str(confidence_score), "overall": 50, "breakdown": {}}
+    # Rewritten below; copy it so `raw` (possibly a cached payload) is left untouched
+    confidence_score = dict(confidence_score)
         
     breakdown = confidence_score.get("breakdown", {})
     if not isinstance(breakdown, dict):
@@ -233,7 +262,7 @@ def normalize_output(raw: Dict[str, Any], user_text: str, db: Optional[Dict[str,
         "confidence_score": confidence_score,
         "skill_gap_analysis": skill_gap_analysis,
         "keywords_found": keywords_found,
-        "upskill": build_upskill(user_text, db)
+        "upskill": build_upskill(user_text, db, fetch_videos)
     }
 
 def fallback_response() -> Dict[str, Any]:
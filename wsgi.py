@@ -0,0 +1,20 @@
+"""
+Production WSGI entry point for GuideFY.
+
+Run with gunicorn using the bundled configuration:
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app enabled this module is imported once in the gunicorn master,
+so preload() loads spaCy, the field taxonomy and the upskill DB before the
+workers are forked and they share that memory copy-on-write.
+"""
+
+import os
+
+# Production app: debug disabled regardless of the environment. app.py builds its module-level
+# app on import, so this must be set first; that app is reused rather than building a second one.
+os.environ["FLASK_DEBUG"] = "0"
+
+from app import app, preload
+
+preload()